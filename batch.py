@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Headless Batch Processor
+
+Applies node tree handlers to many .blend files, using a pool of
+`blender --background` worker processes.
+
+Usage:
+    python batch.py DIRECTORY [options]
+
+Examples:
+    python batch.py assets/ --dry-run
+    python batch.py assets/ --recursive --handlers node.randomize_seed
+    python batch.py assets/ --workers 8 --output results.json
+
+Setup:
+    Set BLENDER_PATH in .env (see build.py), or pass --blender.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+
+ADDON_DIR = Path(__file__).resolve().parent
+ADDON_PACKAGE = "blender_tools"
+# Chunks per worker, smaller chunks balance uneven files better
+CHUNKS_PER_WORKER = 4
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply node tree handlers to .blend files in background Blender processes."
+    )
+    parser.add_argument("directory", type=Path, help="Directory of .blend files")
+    parser.add_argument(
+        "--handlers",
+        nargs="+",
+        default=[],
+        metavar="IDNAME",
+        help="Handler operators to run, e.g. node.randomize_seed (default: all)",
+    )
+    parser.add_argument(
+        "--recursive", action="store_true", help="Also search subdirectories"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report changes without saving files"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of Blender processes (default: number of CPUs)",
+    )
+    parser.add_argument("--blender", help="Blender executable (default: BLENDER_PATH)")
+    parser.add_argument("--output", type=Path, help="Write the JSON results to a file")
+    return parser.parse_args(argv)
+
+
+# --- Worker, runs inside Blender ---
+
+
+def load_addon():
+    """Import the add-on as a package, without registering its interface."""
+    spec = importlib.util.spec_from_file_location(
+        ADDON_PACKAGE,
+        ADDON_DIR / "__init__.py",
+        submodule_search_locations=[str(ADDON_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    sys.modules[ADDON_PACKAGE] = module
+    spec.loader.exec_module(module)  # type: ignore
+    # Handlers store counters and opt-outs in custom node tree properties
+    module.properties.register()
+    return module
+
+
+def process_file(filepath: str, handlers: list, dry_run: bool) -> dict:
+    import bpy
+    from blender_tools.src.utils.handlers import run_handlers_on_trees
+
+    start = perf_counter()
+    result: dict = {"file": filepath, "changed": {}, "saved": False, "error": None}
+    try:
+        bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+        names = [tree.name for tree in bpy.data.node_groups if tree.library is None]
+        changed = dict.fromkeys((cls.bl_idname for cls in handlers), 0)
+        for _, modified in run_handlers_on_trees(names, handlers):
+            for cls in modified:
+                changed[cls.bl_idname] += 1
+        result["trees"] = len(names)
+        result["changed"] = changed
+        if any(changed.values()) and not dry_run:
+            bpy.ops.wm.save_mainfile(filepath=filepath)
+            result["saved"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = perf_counter() - start
+    return result
+
+
+def run_worker(argv: list[str]) -> None:
+    """Process files inside Blender and write one JSON result per line."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--handlers", nargs="*", default=[])
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+
+    addon = load_addon()
+    from blender_tools.src.utils.handlers import is_handler_operator
+
+    handlers = [
+        cls
+        for cls in addon.operators.classes
+        if is_handler_operator(cls)
+        and (not args.handlers or cls.bl_idname in args.handlers)
+    ]
+    # Written as we go, results of processed files survive a crash on a later one
+    with open(args.result, "w", encoding="utf-8") as f:
+        for filepath in args.files:
+            f.write(json.dumps(process_file(filepath, handlers, args.dry_run)) + "\n")
+            f.flush()
+
+
+# --- Pool, runs in the calling Python ---
+
+
+def find_blend_files(directory: Path, recursive: bool) -> list[Path]:
+    pattern = "**/*.blend" if recursive else "*.blend"
+    return sorted(path for path in directory.glob(pattern) if path.is_file())
+
+
+def run_chunk(
+    blender_path: str, files: list[Path], handlers: list[str], dry_run: bool
+) -> list[dict]:
+    """Process a chunk of files in one Blender process."""
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = Path(tmp) / "result.jsonl"
+        cmd = [
+            blender_path,
+            "--background",
+            "--factory-startup",
+            # One thread per process, parallelism comes from the pool
+            "--threads",
+            "1",
+            "--python",
+            str(Path(__file__).resolve()),
+            "--",
+            "--worker",
+            "--result",
+            str(result_path),
+        ]
+        if handlers:
+            cmd += ["--handlers", *handlers]
+        if dry_run:
+            cmd.append("--dry-run")
+        cmd += [str(path) for path in files]
+
+        process = subprocess.run(cmd, capture_output=True, text=True)
+        if result_path.exists():
+            with open(result_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Cut short by a crash while writing
+                        continue
+                    results[result["file"]] = result
+    if len(results) == len(files):
+        return list(results.values())
+
+    # Files the worker didn't get to, or crashed on
+    error = f"Blender exited with code {process.returncode}"
+    lines = process.stderr.strip().splitlines()
+    if lines:
+        error += f": {lines[-1]}"
+    return [
+        results.get(str(path))
+        or {"file": str(path), "changed": {}, "saved": False, "error": error}
+        for path in files
+    ]
+
+
+def run_pool(
+    blender_path: str,
+    files: list[Path],
+    handlers: list[str],
+    dry_run: bool,
+    workers: int,
+) -> list[dict]:
+    # Keep every worker busy while amortizing Blender's startup over files
+    chunk_size = max(1, math.ceil(len(files) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+    results: list[dict] = []
+    # Threads only wait on the Blender processes
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_chunk, blender_path, chunk, handlers, dry_run)
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                status = "❌" if result["error"] else "✅"
+                print(f"{status} {result['file']}")
+                results.append(result)
+    return sorted(results, key=lambda result: result["file"])
+
+
+def summarize(results: list[dict], dry_run: bool, seconds: float) -> dict:
+    totals: dict[str, int] = {}
+    for result in results:
+        for idname, count in result["changed"].items():
+            totals[idname] = totals.get(idname, 0) + count
+    return {
+        "dry_run": dry_run,
+        "seconds": seconds,
+        "files": len(results),
+        "saved": sum(result["saved"] for result in results),
+        "errors": sum(result["error"] is not None for result in results),
+        "changed": totals,
+        "results": results,
+    }
+
+
+def main():
+    if "--" in sys.argv:
+        # Running inside Blender
+        argv = sys.argv[sys.argv.index("--") + 1 :]
+        if argv and argv[0] == "--worker":
+            run_worker(argv[1:])
+            return
+
+    args = parse_args(sys.argv[1:])
+    from build import load_env, get_blender_path
+
+    load_env()
+    if args.blender:
+        os.environ["BLENDER_PATH"] = args.blender
+    blender_path = get_blender_path()
+    if not blender_path:
+        sys.exit(1)
+
+    files = find_blend_files(args.directory, args.recursive)
+    if not files:
+        print(f"❌ No .blend files found in {args.directory}")
+        sys.exit(1)
+    workers = max(1, min(args.workers, len(files)))
+    print(f"Processing {len(files)} files with {workers} Blender processes...")
+
+    start = perf_counter()
+    results = run_pool(blender_path, files, args.handlers, args.dry_run, workers)
+    summary = summarize(results, args.dry_run, perf_counter() - start)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    else:
+        print(json.dumps(summary, indent=2))
+    if summary["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
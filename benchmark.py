@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Synthetic Node Tree Benchmarks
+
+Generates node trees of increasing size and measures the operators, handlers
+and handler pipeline on them in background Blender. Results are written to a
+JSON file that later runs can be compared against.
+
+Usage:
+    python benchmark.py [options]
+
+Examples:
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json
+    python benchmark.py --nodes 1000 5000 --fan-out 1 16 --depth 3 --panels 32
+    python benchmark.py --fake --nodes 1000 --repeat 10
+
+With --fake, benchmarks run in the current Python against the pure-Python
+stand-in for bpy in fake_bpy/. Timings then reflect the add-on's own
+algorithms only, not Blender's, and can't be compared with Blender runs.
+
+Setup:
+    Set BLENDER_PATH in .env (see build.py), or pass --blender.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+from time import perf_counter, time
+from types import SimpleNamespace
+from typing import Any, Callable, NamedTuple
+
+ADDON_DIR = Path(__file__).resolve().parent
+FAKE_BPY_DIR = ADDON_DIR / "fake_bpy"
+
+# Interface sockets per panel of generated trees
+SOCKETS_PER_PANEL = 4
+# Nodes per frame, frames per parent frame
+FRAME_SIZE = 100
+FRAMES_PER_PARENT = 10
+# Every nth consumer node takes a seed
+SEED_EVERY = 8
+# Regressions smaller than this are noise, whatever their ratio
+NOISE_FLOOR_MS = 0.5
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark operators and handlers on generated node trees."
+    )
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000],
+        help="Total node counts to generate (default: 1000 10000 50000)",
+    )
+    parser.add_argument(
+        "--fan-out",
+        type=int,
+        nargs="+",
+        default=[4],
+        help="Links per Group Input socket (default: 4)",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Levels of nested node groups the nodes are spread over (default: 1)",
+    )
+    parser.add_argument(
+        "--panels",
+        type=int,
+        nargs="+",
+        default=[8],
+        help=f"Interface panels of {SOCKETS_PER_PANEL} sockets each (default: 8)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per benchmark (default: 3)"
+    )
+    parser.add_argument(
+        "--filter", default="", help="Only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--output", type=Path, help="Write the results to a JSON file")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against a previous results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression (default: 0.1)",
+    )
+    parser.add_argument("--blender", help="Blender executable (default: BLENDER_PATH)")
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Run in this Python with the bpy stand-in instead of Blender",
+    )
+    return parser.parse_args(argv)
+
+
+class Case(NamedTuple):
+    nodes: int
+    fan_out: int
+    depth: int
+    panels: int
+
+    @property
+    def key(self) -> str:
+        return (
+            f"nodes={self.nodes},fan_out={self.fan_out},"
+            f"depth={self.depth},panels={self.panels}"
+        )
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Receives the root tree and returns the function to measure
+    setup: Callable[[Any], Callable[[], Any]]
+    # Modifies the tree, so it needs a fresh one for every run
+    mutates: bool = True
+    # Nesting depth below which the benchmark has nothing to work on
+    min_depth: int = 1
+
+
+# --- Tree generation ---
+
+
+def generate_tree(name: str, case: Case, level: int = 0):
+    """Generate a geometry node tree, nesting groups down to `case.depth`."""
+    import bpy
+
+    node_tree = bpy.data.node_groups.new(f"{name}_{level}", "GeometryNodeTree")
+    interface = node_tree.interface
+    interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    interface.new_socket("Seed", in_out="INPUT", socket_type="NodeSocketInt")
+    for i in range(case.panels):
+        panel = interface.new_panel(f"Panel {i}")
+        for j in range(SOCKETS_PER_PANEL):
+            interface.new_socket(
+                f"Value {i}.{j}",
+                in_out="INPUT",
+                socket_type="NodeSocketFloat",
+                parent=panel,
+            )
+    interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+
+    nodes = node_tree.nodes
+    links = node_tree.links
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-400, 0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400, 0)
+
+    # Nodes are spread evenly over the nesting levels
+    count = max(1, case.nodes // case.depth - 2)
+    frames = []
+    consumers = []
+    for i in range(count):
+        if i % FRAME_SIZE == 0:
+            frame = nodes.new("NodeFrame")
+            if len(frames) % FRAMES_PER_PARENT == 0:
+                parent_frame = nodes.new("NodeFrame")
+            frame.parent = parent_frame
+            frames.append(frame)
+        if i % SEED_EVERY == 0:
+            node = nodes.new("GeometryNodeDistributePointsOnFaces")
+        else:
+            node = nodes.new("ShaderNodeMath")
+            # Chain math nodes to add links between consumers
+            if consumers and consumers[-1].bl_idname == "ShaderNodeMath":
+                links.new(consumers[-1].outputs[0], node.inputs[0])
+        node.parent = frames[-1]
+        node.location = (200 * (i // 50), -200 * (i % 50))
+        consumers.append(node)
+
+    # Link every Group Input socket to `fan_out` consumers of matching type
+    seed_consumers = consumers[::SEED_EVERY]
+    value_consumers = [node for node in consumers if node.bl_idname == "ShaderNodeMath"]
+    offset = 0
+    for socket in group_input.outputs:
+        if socket.type == "INT":
+            targets, input_name = seed_consumers, "Seed"
+        elif socket.type == "VALUE":
+            targets, input_name = value_consumers, None
+        else:
+            continue
+        for k in range(case.fan_out):
+            if not targets:
+                break
+            node = targets[(offset + k) % len(targets)]
+            to_socket = node.inputs[input_name] if input_name else node.inputs[1]
+            links.new(socket, to_socket)
+        offset += case.fan_out
+
+    if level + 1 < case.depth:
+        child = generate_tree(name, case, level + 1)
+        group = nodes.new("GeometryNodeGroup")
+        group.node_tree = child
+        group.location = (0, 400)
+        for socket in group_input.outputs:
+            if socket.type in {"INT", "VALUE"} and socket.name in group.inputs:
+                links.new(socket, group.inputs[socket.name])
+    return node_tree
+
+
+def remove_trees(name: str) -> None:
+    import bpy
+
+    for node_tree in [t for t in bpy.data.node_groups if t.name.startswith(name)]:
+        bpy.data.node_groups.remove(node_tree)
+
+
+# --- Benchmarks ---
+
+
+def make_context(node_tree, selected_nodes) -> SimpleNamespace:
+    """Node editor context for operators, without a window."""
+    space = SimpleNamespace(type="NODE_EDITOR", node_tree=node_tree, edit_tree=node_tree)
+    return SimpleNamespace(space_data=space, selected_nodes=list(selected_nodes))
+
+
+def make_operator(**properties) -> SimpleNamespace:
+    """Stand-in for an operator instance, registered operators can't be created."""
+    return SimpleNamespace(report=lambda *args: None, **properties)
+
+
+def get_benchmarks(addon) -> list[Benchmark]:
+    from blender_tools.src import handlers as dispatcher
+    from blender_tools.src.utils.delta import capture_state
+    from blender_tools.src.utils.handlers import (
+        is_handler_operator,
+        run_node_tree_handlers,
+    )
+    from blender_tools.src.operators import (
+        HideResizeNode,
+        MatchGroupInterface,
+        SplitMergeGroupInput,
+    )
+    from blender_tools.src.operators.split_group_input import Mode
+
+    def by_type(node_tree, bl_idname: str) -> list:
+        return [node for node in node_tree.nodes if node.bl_idname == bl_idname]
+
+    def run_operator(cls, nodes: Callable[[Any], list], **properties):
+        def setup(node_tree):
+            context = make_context(node_tree, nodes(node_tree))
+            return lambda: cls._execute(make_operator(**properties), context)
+
+        return setup
+
+    def run_handler(cls):
+        return lambda node_tree: lambda: run_node_tree_handlers(node_tree, [cls])
+
+    handlers = [cls for cls in addon.operators.classes if is_handler_operator(cls)]
+
+    def dispatch(node_tree) -> None:
+        # Depsgraph update of the tree, then the queue processed in one go
+        depsgraph = SimpleNamespace(updates=[SimpleNamespace(id=node_tree)])
+        dispatcher.depsgraph_handler(None, depsgraph)
+        dispatcher.run_handlers(float("inf"), handlers)
+        if dispatcher.is_timer_registered(dispatcher.process_queue):
+            dispatcher.unregister_timer(dispatcher.process_queue)
+
+    def first_dispatch(node_tree):
+        # A tree the dispatcher hasn't seen yet, all handlers are polled
+        dispatcher.load_handler()
+        return lambda: dispatch(node_tree)
+
+    def unchanged_dispatch(node_tree):
+        # Steady state of a value-only edit: the tree is known and unchanged
+        dispatcher.load_handler()
+        dispatch(node_tree)
+        dispatcher.edit_tracker.clear()
+        return lambda: dispatch(node_tree)
+
+    benchmarks = [
+        Benchmark("pipeline.dispatch", first_dispatch),
+        Benchmark("pipeline.unchanged", unchanged_dispatch),
+        Benchmark(
+            "pipeline.capture_state",
+            lambda node_tree: lambda: capture_state(node_tree),
+            mutates=False,
+        ),
+    ]
+    benchmarks += [
+        Benchmark(f"handler.{cls.bl_idname}", run_handler(cls)) for cls in handlers
+    ]
+    benchmarks += [
+        Benchmark(
+            f"operator.split_merge.{mode}",
+            run_operator(
+                SplitMergeGroupInput,
+                lambda node_tree: by_type(node_tree, "NodeGroupInput"),
+                mode=mode,
+                process_individually=False,
+            ),
+        )
+        for mode in Mode
+    ]
+    benchmarks += [
+        Benchmark(
+            "operator.match_group_interface",
+            run_operator(
+                MatchGroupInterface,
+                lambda node_tree: by_type(node_tree, "GeometryNodeGroup"),
+            ),
+            # Group nodes only exist in nested trees
+            min_depth=2,
+        ),
+        Benchmark(
+            "operator.hide_resize",
+            run_operator(HideResizeNode, lambda node_tree: list(node_tree.nodes)),
+        ),
+    ]
+    return benchmarks
+
+
+def measure_time(func: Callable[[], Any]) -> float:
+    """Run a function once, returning its duration."""
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+def measure_peak(func: Callable[[], Any]) -> int:
+    """Run a function once, returning its peak Python memory.
+
+    Kept apart from timing runs, tracing allocations slows the code down.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(case: Case, benchmarks: list[Benchmark], repeat: int) -> dict:
+    name = "Benchmark"
+    results: dict[str, dict] = {}
+    shared = None
+
+    def get_tree(benchmark: Benchmark):
+        nonlocal shared
+        if benchmark.mutates:
+            remove_trees(name)
+            shared = None
+            return generate_tree(name, case)
+        if shared is None:
+            remove_trees(name)
+            shared = generate_tree(name, case)
+        return shared
+
+    try:
+        for benchmark in benchmarks:
+            if case.depth < benchmark.min_depth:
+                continue
+            times = [
+                measure_time(benchmark.setup(get_tree(benchmark)))
+                for _ in range(repeat)
+            ]
+            peak = measure_peak(benchmark.setup(get_tree(benchmark)))
+            results[benchmark.name] = {
+                "median_ms": statistics.median(times) * 1000,
+                "min_ms": min(times) * 1000,
+                "peak_kib": peak / 1024,
+            }
+            print(
+                f"  {benchmark.name:<40} "
+                f"{results[benchmark.name]['median_ms']:10.2f} ms "
+                f"{results[benchmark.name]['peak_kib']:10.1f} KiB"
+            )
+    finally:
+        remove_trees(name)
+    return results
+
+
+def run_benchmarks(args: argparse.Namespace) -> dict:
+    import bpy
+
+    # Inside Blender the script's directory isn't on the path
+    sys.path.insert(0, str(ADDON_DIR))
+    from batch import load_addon
+
+    addon = load_addon()
+    benchmarks = [b for b in get_benchmarks(addon) if args.filter in b.name]
+    results: dict[str, dict] = {}
+    for values in itertools.product(args.nodes, args.fan_out, args.depth, args.panels):
+        case = Case(*values)
+        print(f"{case.key}")
+        results[case.key] = run_case(case, benchmarks, args.repeat)
+    return {
+        "meta": {
+            "timestamp": time(),
+            "blender": bpy.app.version_string,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the benchmarks that got slower than the baseline."""
+    regressions: list[str] = []
+    for case, benchmarks in results["results"].items():
+        for name, result in benchmarks.items():
+            previous = baseline.get("results", {}).get(case, {}).get(name)
+            if previous is None:
+                continue
+            new, old = result["median_ms"], previous["median_ms"]
+            if new > old * (1 + threshold) and new - old > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"{case} {name}: {old:.2f} ms -> {new:.2f} ms "
+                    f"(+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def run(argv: list[str]) -> int:
+    args = parse_args(argv)
+    results = run_benchmarks(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"✅ No regressions against {args.baseline}")
+        return 0
+    print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1
+
+
+def main():
+    if "--" in sys.argv:
+        # Running inside Blender
+        sys.exit(run(sys.argv[sys.argv.index("--") + 1 :]))
+
+    args = parse_args(sys.argv[1:])
+    if args.fake:
+        sys.path.insert(0, str(FAKE_BPY_DIR))
+        sys.exit(run(sys.argv[1:]))
+
+    from build import load_env, get_blender_path
+
+    load_env()
+    if args.blender:
+        os.environ["BLENDER_PATH"] = args.blender
+    blender_path = get_blender_path()
+    if not blender_path:
+        sys.exit(1)
+    cmd = [
+        blender_path,
+        "--background",
+        "--factory-startup",
+        "--python-exit-code",
+        "1",
+        "--python",
+        str(Path(__file__).resolve()),
+        "--",
+        *sys.argv[1:],
+    ]
+    sys.exit(subprocess.run(cmd).returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Minimal pure-Python stand-in for the parts of ``bpy`` used by the add-on."""
+
+from __future__ import annotations
+
+from . import app, props, types, utils, ops
+from .types import BlendData, Context
+
+data = BlendData()
+context = Context(data)
+
+
+def reset() -> None:
+    """Drop all data and registrations, as if Blender was restarted."""
+    global data
+    data = BlendData()
+    context._reset(data)
+    app._reset()
+    utils._reset()
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from . import handlers, timers
+
+version = (4, 2, 0)
+version_string = "4.2.0 (fake)"
+background = True
+
+
+def _reset() -> None:
+    handlers._reset()
+    timers._reset()
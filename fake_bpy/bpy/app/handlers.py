@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+depsgraph_update_post: list = []
+load_post: list = []
+load_pre: list = []
+undo_post: list = []
+redo_post: list = []
+save_pre: list = []
+
+
+def persistent(func):
+    func._bpy_persistent = True
+    return func
+
+
+def _reset() -> None:
+    for handlers in (
+        depsgraph_update_post,
+        load_post,
+        load_pre,
+        undo_post,
+        redo_post,
+        save_pre,
+    ):
+        handlers.clear()
@@ -0,0 +1,52 @@
+"""Timers driven manually through :func:`run`, sleeping until each is due."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+_timers: dict[Callable, float] = {}
+clock = 0.0
+
+
+def register(function: Callable, first_interval: float = 0.0, persistent: bool = False) -> None:
+    _timers[function] = clock + first_interval
+
+
+def unregister(function: Callable) -> None:
+    if function not in _timers:
+        raise ValueError("Error: function is not registered")
+    del _timers[function]
+
+
+def is_registered(function: Callable) -> bool:
+    return function in _timers
+
+
+def run(until: float | None = None, max_calls: int = 10000) -> int:
+    """Advance the virtual clock, calling due timers. Returns the number of calls."""
+    global clock
+    calls = 0
+    while _timers and calls < max_calls:
+        function, due = min(_timers.items(), key=lambda item: item[1])
+        if until is not None and due > until:
+            break
+        if due > clock:
+            time.sleep(due - clock)
+            clock = due
+        calls += 1
+        interval = function()
+        if function in _timers and _timers[function] == due:
+            if interval is None:
+                del _timers[function]
+            else:
+                _timers[function] = clock + interval
+    if until is not None:
+        clock = max(clock, until)
+    return calls
+
+
+def _reset() -> None:
+    global clock
+    _timers.clear()
+    clock = 0.0
@@ -0,0 +1,63 @@
+"""Operator access through ``bpy.ops.<module>.<name>(**props)``."""
+
+from __future__ import annotations
+
+from . import utils as _utils
+
+
+def _undo_push(message: str = "") -> set[str]:
+    import bpy
+
+    bpy.data.undo_stack.append(message)
+    return {"FINISHED"}
+
+
+_BUILTINS = {
+    "ed.undo_push": _undo_push,
+}
+
+
+class _OperatorCall:
+    def __init__(self, idname: str):
+        self.idname = idname
+
+    def _cls(self):
+        for cls in _utils._registered:
+            if getattr(cls, "bl_idname", None) == self.idname:
+                return cls
+        raise AttributeError(f"Calling operator 'bpy.ops.{self.idname}' error, could not be found")
+
+    def poll(self) -> bool:
+        import bpy
+
+        if self.idname in _BUILTINS:
+            return True
+        cls = self._cls()
+        return not hasattr(cls, "poll") or cls.poll(bpy.context)
+
+    def __call__(self, *args, **keywords):
+        import bpy
+
+        if self.idname in _BUILTINS:
+            return _BUILTINS[self.idname](**keywords)
+        cls = self._cls()
+        if hasattr(cls, "poll") and not cls.poll(bpy.context):
+            raise RuntimeError(f"Operator bpy.ops.{self.idname}.poll() failed, context is incorrect")
+        op = cls.__new__(cls)
+        op._init_properties(keywords)
+        result = op.execute(bpy.context)
+        return result
+
+
+class _OperatorModule:
+    def __init__(self, module: str):
+        self.module = module
+
+    def __getattr__(self, name: str) -> _OperatorCall:
+        return _OperatorCall(f"{self.module}.{name}")
+
+
+def __getattr__(module: str) -> _OperatorModule:
+    if module.startswith("__"):
+        raise AttributeError(module)
+    return _OperatorModule(module)
@@ -0,0 +1,47 @@
+"""Property definitions are kept as ``(function, keywords)`` like Blender does."""
+
+from __future__ import annotations
+
+
+class _PropertyDeferred:
+    def __init__(self, function, keywords):
+        self.function = function
+        self.keywords = keywords
+
+    # Properties assigned to an existing class (``NodeTree.my_prop = ...``)
+    # behave like registered ones
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        from .types import _property_default
+
+        values = obj.__dict__.setdefault("_rna_values", {})
+        if id(self) not in values:
+            values[id(self)] = _property_default(self)
+        return values[id(self)]
+
+    def __set__(self, obj, value):
+        obj.__dict__.setdefault("_rna_values", {})[id(self)] = value
+
+    def __repr__(self):
+        return f"<{self.function.__name__} {self.keywords}>"
+
+
+def _make(name):
+    def prop(**keywords):
+        return _PropertyDeferred(prop, keywords)
+
+    prop.__name__ = name
+    return prop
+
+
+BoolProperty = _make("BoolProperty")
+IntProperty = _make("IntProperty")
+FloatProperty = _make("FloatProperty")
+StringProperty = _make("StringProperty")
+EnumProperty = _make("EnumProperty")
+PointerProperty = _make("PointerProperty")
+CollectionProperty = _make("CollectionProperty")
+BoolVectorProperty = _make("BoolVectorProperty")
+IntVectorProperty = _make("IntVectorProperty")
+FloatVectorProperty = _make("FloatVectorProperty")
@@ -0,0 +1,1238 @@
+"""Pure-Python models of the ``bpy.types`` used by the add-on.
+
+Only the behaviour the add-on relies on is modelled: node trees with their
+nodes, sockets, links and interface, property registration and the pieces of
+context and window manager API touched by operators and panels.
+"""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from itertools import count
+from typing import Any, Callable, Iterable, Iterator
+
+from .props import _PropertyDeferred
+
+# --------------------------------------------------------------------------
+# Property registration
+# --------------------------------------------------------------------------
+
+_TYPE_DEFAULTS = {
+    "BoolProperty": False,
+    "IntProperty": 0,
+    "FloatProperty": 0.0,
+    "StringProperty": "",
+}
+
+
+def _property_default(deferred: _PropertyDeferred) -> Any:
+    name = deferred.function.__name__
+    keywords = deferred.keywords
+    if name == "PointerProperty":
+        return _new_struct(keywords["type"])
+    if name == "CollectionProperty":
+        return PropertyCollection(keywords["type"])
+    if name == "EnumProperty":
+        if "default" in keywords:
+            return keywords["default"]
+        if "ENUM_FLAG" in keywords.get("options", ()):
+            return set()
+        items = keywords.get("items", ())
+        if callable(items):
+            items = items(None, None)
+        return items[0][0] if items else ""
+    if "default" in keywords:
+        return keywords["default"]
+    return _TYPE_DEFAULTS.get(name)
+
+
+def _install_property(owner: type, name: str, deferred: _PropertyDeferred) -> None:
+    setattr(owner, name, RNAProperty(name, deferred))
+
+
+class RNAProperty:
+    """Descriptor storing a registered property value on each instance."""
+
+    def __init__(self, name: str, deferred: _PropertyDeferred):
+        self.name = name
+        self.deferred = deferred
+        self.keywords = deferred.keywords
+
+    def __get__(self, obj: Any, owner: type | None = None) -> Any:
+        if obj is None:
+            return self
+        values = obj.__dict__.setdefault("_rna_values", {})
+        if self.name not in values:
+            values[self.name] = _property_default(self.deferred)
+        return values[self.name]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__.setdefault("_rna_values", {})[self.name] = value
+
+
+def _evaluate_annotations(cls: type) -> None:
+    module = sys.modules.get(cls.__module__)
+    namespace = dict(vars(module)) if module else {}
+    for name, annotation in list(cls.__dict__.get("__annotations__", {}).items()):
+        if isinstance(cls.__dict__.get(name), RNAProperty):
+            continue
+        if isinstance(annotation, str):
+            try:
+                annotation = eval(annotation, namespace)
+            except Exception:
+                continue
+        if isinstance(annotation, _PropertyDeferred):
+            _install_property(cls, name, annotation)
+
+
+def _new_struct(cls: type) -> Any:
+    for klass in reversed(cls.__mro__):
+        if "__annotations__" in klass.__dict__:
+            _evaluate_annotations(klass)
+    obj = cls.__new__(cls)
+    return obj
+
+
+class bpy_struct:
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _evaluate_annotations(cls)
+
+    def as_pointer(self) -> int:
+        return id(self)
+
+    def _init_properties(self, values: dict[str, Any]) -> None:
+        for klass in reversed(type(self).__mro__):
+            if "__annotations__" in klass.__dict__:
+                _evaluate_annotations(klass)
+        for name, value in values.items():
+            if not isinstance(getattr(type(self), name, None), RNAProperty):
+                raise TypeError(f"keyword \"{name}\" unrecognized")
+            setattr(self, name, value)
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+class bpy_prop_collection(list):
+    """List with Blender's name lookups and bulk attribute access."""
+
+    def _lookup(self, key: str) -> Any:
+        for item in self:
+            if getattr(item, "name", None) == key:
+                return item
+        return None
+
+    def __getitem__(self, key: Any) -> Any:  # type: ignore[override]
+        if isinstance(key, str):
+            item = self._lookup(key)
+            if item is None:
+                raise KeyError(f'bpy_prop_collection[key]: key "{key}" not found')
+            return item
+        return super().__getitem__(key)
+
+    def __contains__(self, key: Any) -> bool:  # type: ignore[override]
+        if isinstance(key, str):
+            return self._lookup(key) is not None
+        return any(item is key for item in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._lookup(key)
+        return default if item is None else item
+
+    def find(self, key: str) -> int:
+        for index, item in enumerate(self):
+            if getattr(item, "name", None) == key:
+                return index
+        return -1
+
+    def keys(self) -> list[str]:
+        return [item.name for item in self]
+
+    def values(self) -> list[Any]:
+        return list(self)
+
+    def items(self) -> list[tuple[str, Any]]:
+        return [(item.name, item) for item in self]
+
+    def foreach_get(self, attr: str, seq: Any) -> None:
+        values = [getattr(item, attr) for item in self]
+        if values and isinstance(values[0], (Vector, tuple, list)):
+            values = [component for value in values for component in value]
+        if len(values) != len(seq):
+            raise RuntimeError(
+                f"internal error setting the array: expected {len(values)}, got {len(seq)}"
+            )
+        seq[:] = values
+
+    def foreach_set(self, attr: str, seq: Any) -> None:
+        if not len(self):
+            return
+        sample = getattr(self[0], attr)
+        size = len(sample) if isinstance(sample, (Vector, tuple, list)) else 1
+        if len(seq) != size * len(self):
+            raise RuntimeError(
+                f"internal error setting the array: expected {size * len(self)}, got {len(seq)}"
+            )
+        values = list(seq)
+        for index, item in enumerate(self):
+            if size == 1:
+                value = values[index]
+                if isinstance(sample, bool):
+                    value = bool(value)
+                setattr(item, attr, value)
+            else:
+                setattr(item, attr, values[index * size : (index + 1) * size])
+
+
+class PropertyCollection(bpy_prop_collection):
+    def __init__(self, item_type: type):
+        super().__init__()
+        self.item_type = item_type
+
+    def add(self) -> Any:
+        item = _new_struct(self.item_type)
+        self.append(item)
+        return item
+
+    def remove(self, index: int) -> None:  # type: ignore[override]
+        del self[index]
+
+
+bpy_prop_collection_idprop = PropertyCollection
+
+
+# --------------------------------------------------------------------------
+# Math
+# --------------------------------------------------------------------------
+
+
+class Vector:
+    __slots__ = ("_values", "_owner")
+
+    def __init__(self, values: Iterable[float] = (0.0, 0.0), owner: Any = None):
+        self._values = [float(v) for v in values]
+        self._owner = owner
+
+    def _changed(self) -> None:
+        if self._owner is not None:
+            self._owner._tag()
+
+    @property
+    def x(self) -> float:
+        return self._values[0]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._values[0] = float(value)
+        self._changed()
+
+    @property
+    def y(self) -> float:
+        return self._values[1]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._values[1] = float(value)
+        self._changed()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._values)
+
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+    def __setitem__(self, index: int, value: float) -> None:
+        self._values[index] = float(value)
+        self._changed()
+
+    def __add__(self, other: Iterable[float]) -> Vector:
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other: Iterable[float]) -> Vector:
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __eq__(self, other: Any) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Vector({tuple(self._values)})"
+
+    def copy(self) -> Vector:
+        return Vector(self._values)
+
+    def to_tuple(self) -> tuple[float, ...]:
+        return tuple(self._values)
+
+
+# --------------------------------------------------------------------------
+# IDs and node trees
+# --------------------------------------------------------------------------
+
+_session_uid = count(1)
+
+
+class ID(bpy_struct):
+    id_type = "ID"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.library = None
+        self.session_uid = next(_session_uid)
+        self.use_fake_user = False
+
+    def __repr__(self) -> str:
+        return f"bpy.data.{type(self).__name__.lower()}s['{self.name}']"
+
+
+class NodeSocket(bpy_struct):
+    bl_idname = "NodeSocket"
+
+    def __init__(
+        self,
+        node: Node,
+        name: str,
+        identifier: str,
+        type: str,
+        is_output: bool,
+        hide_value: bool = False,
+    ):
+        self.node = node
+        self.name = name
+        self.identifier = identifier
+        self.type = type
+        self.is_output = is_output
+        self.hide = False
+        self.enabled = True
+        self.hide_value = hide_value
+        self.link_limit = 4095 if is_output else 1
+        self.default_value: Any = 0
+        self._links: list[NodeLink] = []
+
+    @property
+    def is_linked(self) -> bool:
+        return bool(self._links)
+
+    @property
+    def links(self) -> tuple[NodeLink, ...]:
+        return tuple(self._links)
+
+    @property
+    def is_multi_input(self) -> bool:
+        return self.link_limit > 1 and not self.is_output
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in ("hide", "enabled", "default_value", "name"):
+            node = self.__dict__.get("node")
+            if node is not None:
+                node._tag()
+
+    def __repr__(self) -> str:
+        return f"<NodeSocket {self.node.name}.{self.identifier}>"
+
+
+class NodeSockets(bpy_prop_collection):
+    def __init__(self, node: Node, is_output: bool):
+        super().__init__()
+        self.node = node
+        self.is_output = is_output
+
+    def _lookup(self, key: str) -> Any:
+        for socket in self:
+            if socket.identifier == key:
+                return socket
+        return super()._lookup(key)
+
+    def new(self, type: str, name: str, identifier: str = "") -> NodeSocket:
+        socket_type = _SOCKET_TYPES.get(type, type)
+        socket = NodeSocket(self.node, name, identifier or name, socket_type, self.is_output)
+        socket.bl_idname = type
+        self.append(socket)
+        self.node._tag()
+        return socket
+
+
+_SOCKET_TYPES = {
+    "NodeSocketFloat": "VALUE",
+    "NodeSocketInt": "INT",
+    "NodeSocketBool": "BOOLEAN",
+    "NodeSocketVector": "VECTOR",
+    "NodeSocketColor": "RGBA",
+    "NodeSocketString": "STRING",
+    "NodeSocketGeometry": "GEOMETRY",
+    "NodeSocketShader": "SHADER",
+    "NodeSocketMenu": "MENU",
+    "NodeSocketVirtual": "CUSTOM",
+}
+
+
+class Node(bpy_struct):
+    bl_idname = "Node"
+    bl_width_min = 40.0
+    bl_width_max = 700.0
+    bl_width_default = 140.0
+    bl_height_min = 30.0
+    type = "CUSTOM"
+
+    def __init__(self, tree: NodeTree, name: str):
+        d = self.__dict__
+        d["_tree"] = None
+        self.name = name
+        self.label = ""
+        self.hide = False
+        self.mute = False
+        self.select = True
+        self.parent: Node | None = None
+        self.width = self.bl_width_default
+        self.use_custom_color = False
+        self.inputs = NodeSockets(self, False)
+        self.outputs = NodeSockets(self, True)
+        d["_location"] = Vector((0.0, 0.0), self)
+        d["_tree"] = tree
+
+    @property
+    def id_data(self) -> NodeTree:
+        return self._tree
+
+    def _tag(self) -> None:
+        tree = self.__dict__.get("_tree")
+        if tree is not None:
+            tree._tag()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "location":
+            self._location._values[:] = [float(v) for v in value]
+            self._tag()
+            return
+        object.__setattr__(self, name, value)
+        self._tag()
+
+    @property
+    def location(self) -> Vector:
+        return self._location
+
+    @property
+    def location_absolute(self) -> Vector:
+        location = self._location.copy()
+        parent = self.parent
+        while parent is not None:
+            location = location + parent._location
+            parent = parent.parent
+        return location
+
+    @property
+    def dimensions(self) -> Vector:
+        if self.hide:
+            return Vector((self.width, self.bl_height_min))
+        sockets = sum(not s.hide and s.enabled for s in self.inputs)
+        sockets += sum(not s.hide and s.enabled for s in self.outputs)
+        return Vector((self.width, 30.0 + 22.0 * sockets))
+
+    @property
+    def internal_links(self) -> tuple:
+        return ()
+
+    def __repr__(self) -> str:
+        return f"bpy.data.node_groups['{self._tree.name}'].nodes['{self.name}']"
+
+
+class NodeGroupInput(Node):
+    bl_idname = "NodeGroupInput"
+    type = "GROUP_INPUT"
+
+
+class NodeGroupOutput(Node):
+    bl_idname = "NodeGroupOutput"
+    type = "GROUP_OUTPUT"
+
+
+class NodeFrame(Node):
+    bl_idname = "NodeFrame"
+    type = "FRAME"
+
+
+class NodeReroute(Node):
+    bl_idname = "NodeReroute"
+    type = "REROUTE"
+
+
+class NodeGroup(Node):
+    bl_idname = "NodeGroup"
+    type = "GROUP"
+
+    def __init__(self, tree: NodeTree, name: str):
+        super().__init__(tree, name)
+        self.__dict__["_node_tree"] = None
+
+    @property
+    def node_tree(self) -> NodeTree | None:
+        return self._node_tree
+
+    @node_tree.setter
+    def node_tree(self, value: NodeTree | None) -> None:
+        self.__dict__["_node_tree"] = value
+        _sync_group_sockets(self)
+        self._tag()
+
+
+class GeometryNodeGroup(NodeGroup):
+    bl_idname = "GeometryNodeGroup"
+
+
+class ShaderNodeGroup(NodeGroup):
+    bl_idname = "ShaderNodeGroup"
+
+
+class CompositorNodeGroup(NodeGroup):
+    bl_idname = "CompositorNodeGroup"
+
+
+class FunctionNodeRandomValue(Node):
+    bl_idname = "FunctionNodeRandomValue"
+    type = "RANDOM_VALUE"
+    data_type = "FLOAT"
+
+
+class FunctionNodeInputInt(Node):
+    bl_idname = "FunctionNodeInputInt"
+    type = "INPUT_INT"
+    integer = 0
+
+
+def _make_sockets(node: Node, inputs: Iterable[tuple], outputs: Iterable[tuple]) -> None:
+    for spec in inputs:
+        socket = node.inputs.new(spec[0], spec[1], spec[2] if len(spec) > 2 else "")
+        if len(spec) > 3:
+            socket.hide_value = spec[3]
+    for spec in outputs:
+        node.outputs.new(spec[0], spec[1], spec[2] if len(spec) > 2 else "")
+
+
+# Socket layouts of the built-in node types the fake knows about
+NODE_SOCKETS: dict[str, tuple[tuple[tuple, ...], tuple[tuple, ...]]] = {
+    "NodeReroute": (
+        (("NodeSocketColor", "Input"),),
+        (("NodeSocketColor", "Output"),),
+    ),
+    "FunctionNodeRandomValue": (
+        (
+            ("NodeSocketInt", "Min"),
+            ("NodeSocketInt", "Max"),
+            ("NodeSocketInt", "ID", "ID", True),
+            ("NodeSocketInt", "Seed"),
+        ),
+        (("NodeSocketInt", "Value"),),
+    ),
+    "FunctionNodeInputInt": ((), (("NodeSocketInt", "Integer"),)),
+    "ShaderNodeMath": (
+        (("NodeSocketFloat", "Value"), ("NodeSocketFloat", "Value", "Value_001")),
+        (("NodeSocketFloat", "Value"),),
+    ),
+    "ShaderNodeVectorMath": (
+        (
+            ("NodeSocketVector", "Vector"),
+            ("NodeSocketVector", "Vector", "Vector_001"),
+        ),
+        (("NodeSocketVector", "Vector"), ("NodeSocketFloat", "Value")),
+    ),
+    "ShaderNodeValue": ((), (("NodeSocketFloat", "Value"),)),
+    "ShaderNodeTexNoise": (
+        (
+            ("NodeSocketVector", "Vector", "Vector", True),
+            ("NodeSocketFloat", "Scale"),
+            ("NodeSocketFloat", "Detail"),
+        ),
+        (("NodeSocketFloat", "Fac"), ("NodeSocketColor", "Color")),
+    ),
+    "GeometryNodeDistributePointsOnFaces": (
+        (
+            ("NodeSocketGeometry", "Mesh"),
+            ("NodeSocketFloat", "Density"),
+            ("NodeSocketInt", "Seed"),
+        ),
+        (("NodeSocketGeometry", "Points"), ("NodeSocketVector", "Normal")),
+    ),
+    "GeometryNodeJoinGeometry": (
+        (("NodeSocketGeometry", "Geometry"),),
+        (("NodeSocketGeometry", "Geometry"),),
+    ),
+    "GeometryNodeInputPosition": ((), (("NodeSocketVector", "Position"),)),
+    "GeometryNodeSetPosition": (
+        (
+            ("NodeSocketGeometry", "Geometry"),
+            ("NodeSocketBool", "Selection", "Selection", True),
+            ("NodeSocketVector", "Position", "Position", True),
+            ("NodeSocketVector", "Offset"),
+        ),
+        (("NodeSocketGeometry", "Geometry"),),
+    ),
+}
+
+_NODE_CLASSES: dict[str, type[Node]] = {
+    cls.bl_idname: cls
+    for cls in (
+        NodeGroupInput,
+        NodeGroupOutput,
+        NodeFrame,
+        NodeReroute,
+        GeometryNodeGroup,
+        ShaderNodeGroup,
+        CompositorNodeGroup,
+        FunctionNodeRandomValue,
+        FunctionNodeInputInt,
+    )
+}
+
+
+def _node_class(bl_idname: str) -> type[Node]:
+    cls = _NODE_CLASSES.get(bl_idname)
+    if cls is None:
+        if bl_idname not in NODE_SOCKETS:
+            raise RuntimeError(f"Node type {bl_idname} undefined")
+        cls = type(bl_idname, (Node,), {"bl_idname": bl_idname, "type": bl_idname.upper()})
+        _NODE_CLASSES[bl_idname] = cls
+    return cls
+
+
+def _interface_sockets(tree: NodeTree | None, in_out: str) -> list[NodeTreeInterfaceSocket]:
+    if tree is None:
+        return []
+    return [
+        item
+        for item in tree.interface.items_tree
+        if item.item_type == "SOCKET" and item.in_out == in_out
+    ]
+
+
+def _sync_sockets(
+    sockets: NodeSockets,
+    items: list[NodeTreeInterfaceSocket],
+    virtual: bool,
+) -> None:
+    """Rebuild interface driven sockets, keeping state of the ones that remain."""
+    existing = {socket.identifier: socket for socket in sockets}
+    node = sockets.node
+    tree = node._tree
+    new_sockets: list[NodeSocket] = []
+    for item in items:
+        socket = existing.pop(item.identifier, None)
+        if socket is None:
+            socket = NodeSocket(
+                node,
+                item.name,
+                item.identifier,
+                _SOCKET_TYPES.get(item.socket_type, "VALUE"),
+                sockets.is_output,
+            )
+            socket.bl_idname = item.socket_type
+        else:
+            object.__setattr__(socket, "name", item.name)
+        new_sockets.append(socket)
+    if virtual:
+        socket = existing.pop("__extend__", None) or NodeSocket(
+            node, "", "__extend__", "CUSTOM", sockets.is_output
+        )
+        new_sockets.append(socket)
+    for socket in existing.values():
+        for link in list(socket._links):
+            tree.links.remove(link)
+    list.clear(sockets)
+    list.extend(sockets, new_sockets)
+
+
+def _sync_group_sockets(node: Node) -> None:
+    if isinstance(node, NodeGroupInput):
+        _sync_sockets(node.outputs, _interface_sockets(node._tree, "INPUT"), True)
+    elif isinstance(node, NodeGroupOutput):
+        _sync_sockets(node.inputs, _interface_sockets(node._tree, "OUTPUT"), True)
+    elif isinstance(node, NodeGroup):
+        _sync_sockets(node.inputs, _interface_sockets(node.node_tree, "INPUT"), False)
+        _sync_sockets(node.outputs, _interface_sockets(node.node_tree, "OUTPUT"), False)
+
+
+def _unique_name(collection: Iterable[Any], name: str) -> str:
+    names = {item.name for item in collection}
+    if name not in names:
+        return name
+    base = name
+    if len(name) > 4 and name[-4] == "." and name[-3:].isdigit():
+        base = name[:-4]
+    index = 1
+    while f"{base}.{index:03d}" in names:
+        index += 1
+    return f"{base}.{index:03d}"
+
+
+class Nodes(bpy_prop_collection):
+    def __init__(self, tree: NodeTree):
+        super().__init__()
+        self.tree = tree
+        self._by_name: dict[str, Node] = {}
+        # Next free suffix per base name, keeps creating many nodes linear
+        self._next_index: dict[str, int] = {}
+
+    def _lookup(self, key: str) -> Any:
+        return self._by_name.get(key)
+
+    def new(self, type: str) -> Node:
+        cls = _node_class(type)
+        base = getattr(cls, "_default_name", None) or type.replace("Node", " ").strip()
+        name = base
+        if name in self._by_name:
+            index = self._next_index.get(base, 1)
+            while f"{base}.{index:03d}" in self._by_name:
+                index += 1
+            self._next_index[base] = index + 1
+            name = f"{base}.{index:03d}"
+        node = cls(self.tree, name)
+        if type in NODE_SOCKETS:
+            _make_sockets(node, *NODE_SOCKETS[type])
+        _sync_group_sockets(node)
+        self.append(node)
+        self._by_name[name] = node
+        self.tree._tag()
+        return node
+
+    def remove(self, node: Node) -> None:  # type: ignore[override]
+        if self._by_name.get(node.name) is not node:
+            raise RuntimeError(f"Unable to locate node '{node.name}' in node tree")
+        for socket in (*node.inputs, *node.outputs):
+            for link in list(socket._links):
+                self.tree.links.remove(link)
+        for other in self:
+            if other.parent is node:
+                other.parent = node.parent
+        list.remove(self, node)
+        del self._by_name[node.name]
+        node.__dict__["_tree"] = None
+        self.tree._tag()
+
+    def clear(self) -> None:  # type: ignore[override]
+        for node in list(self):
+            self.remove(node)
+
+    @property
+    def active(self) -> Node | None:
+        return None
+
+
+class NodeLink(bpy_struct):
+    def __init__(self, from_socket: NodeSocket, to_socket: NodeSocket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+        self.is_valid = True
+        self.is_muted = False
+        self.is_hidden = False
+
+    def __repr__(self) -> str:
+        return f"<NodeLink {self.from_socket!r} -> {self.to_socket!r}>"
+
+
+class NodeLinks(bpy_prop_collection):
+    def __init__(self, tree: NodeTree):
+        super().__init__()
+        self.tree = tree
+
+    def new(
+        self,
+        input: NodeSocket,
+        output: NodeSocket,
+        verify_limits: bool = True,
+        handle_dynamic_sockets: bool = False,
+    ) -> NodeLink:
+        # Blender accepts the sockets in either order
+        from_socket, to_socket = input, output
+        if not from_socket.is_output:
+            from_socket, to_socket = to_socket, from_socket
+        if from_socket.node._tree is not self.tree or to_socket.node._tree is not self.tree:
+            raise RuntimeError("Cannot link sockets of another node tree")
+        if verify_limits:
+            while len(to_socket._links) >= to_socket.link_limit:
+                self.remove(to_socket._links[0])
+        link = NodeLink(from_socket, to_socket)
+        from_socket._links.append(link)
+        to_socket._links.append(link)
+        self.append(link)
+        self.tree._tag()
+        return link
+
+    def remove(self, link: NodeLink) -> None:  # type: ignore[override]
+        list.remove(self, link)
+        link.from_socket._links.remove(link)
+        link.to_socket._links.remove(link)
+        link.is_valid = False
+        self.tree._tag()
+
+    def clear(self) -> None:  # type: ignore[override]
+        for link in list(self):
+            self.remove(link)
+
+
+class NodeTreeInterfaceItem(bpy_struct):
+    item_type = "SOCKET"
+
+    def __init__(self, interface: NodeTreeInterface, name: str):
+        self._interface = interface
+        self.name = name
+        self.parent: NodeTreeInterfacePanel | None = None
+
+    @property
+    def position(self) -> int:
+        parent = self.parent
+        return parent.interface_items.index(self) if parent else 0
+
+    @property
+    def index(self) -> int:
+        return self._interface.items_tree.index(self)
+
+
+class NodeTreeInterfaceSocket(NodeTreeInterfaceItem):
+    item_type = "SOCKET"
+    _uids = count(1)
+
+    def __init__(self, interface: NodeTreeInterface, name: str, in_out: str, socket_type: str):
+        super().__init__(interface, name)
+        self.identifier = f"Socket_{next(self._uids)}"
+        self.in_out = in_out
+        self.socket_type = socket_type
+        self.bl_socket_idname = socket_type
+        self.description = ""
+        self.hide_value = False
+        self.hide_in_modifier = False
+        self.is_panel_toggle = False
+        self.menu_expanded = False
+        self.default_input = "VALUE"
+        self.structure_type = "AUTO"
+        self.attribute_domain = "POINT"
+        self.default_attribute_name = ""
+        self.default_value: Any = 0
+        self.min_value = -1e9
+        self.max_value = 1e9
+        self.subtype = "NONE"
+
+
+class NodeTreeInterfacePanel(NodeTreeInterfaceItem):
+    item_type = "PANEL"
+    _uids = count(1)
+
+    def __init__(self, interface: NodeTreeInterface, name: str, root: bool = False):
+        super().__init__(interface, name)
+        self.persistent_uid = 0 if root else next(self._uids)
+        self.description = ""
+        self.default_closed = False
+        self.interface_items: list[NodeTreeInterfaceItem] = []
+
+
+class NodeTreeInterface(bpy_struct):
+    def __init__(self, tree: NodeTree):
+        self.tree = tree
+        self.root = NodeTreeInterfacePanel(self, "", root=True)
+        self.active_index = 0
+
+    @property
+    def items_tree(self) -> bpy_prop_collection:
+        items = bpy_prop_collection()
+
+        def walk(panel: NodeTreeInterfacePanel) -> None:
+            for item in panel.interface_items:
+                items.append(item)
+                if isinstance(item, NodeTreeInterfacePanel):
+                    walk(item)
+
+        walk(self.root)
+        return items
+
+    def _changed(self) -> None:
+        tree = self.tree
+        for node in tree.nodes:
+            if isinstance(node, (NodeGroupInput, NodeGroupOutput)):
+                _sync_group_sockets(node)
+        from . import data
+
+        for other in data.node_groups:
+            for node in other.nodes:
+                if isinstance(node, NodeGroup) and node.node_tree is tree:
+                    _sync_group_sockets(node)
+                    other._tag()
+        tree._tag()
+
+    def _insert(self, item: NodeTreeInterfaceItem, parent: NodeTreeInterfacePanel | None, position: int | None = None) -> None:
+        parent = parent or self.root
+        item.parent = parent
+        if position is None:
+            parent.interface_items.append(item)
+        else:
+            parent.interface_items.insert(position, item)
+
+    def new_socket(
+        self,
+        name: str,
+        description: str = "",
+        in_out: str = "INPUT",
+        socket_type: str = "NodeSocketFloat",
+        parent: NodeTreeInterfacePanel | None = None,
+    ) -> NodeTreeInterfaceSocket:
+        item = NodeTreeInterfaceSocket(self, name, in_out, socket_type)
+        item.description = description
+        self._insert(item, parent)
+        self._changed()
+        return item
+
+    def new_panel(
+        self,
+        name: str,
+        description: str = "",
+        default_closed: bool = False,
+    ) -> NodeTreeInterfacePanel:
+        item = NodeTreeInterfacePanel(self, name)
+        item.description = description
+        item.default_closed = default_closed
+        self._insert(item, None)
+        self._changed()
+        return item
+
+    def move_to_parent(
+        self,
+        item: NodeTreeInterfaceItem,
+        parent: NodeTreeInterfacePanel,
+        to_position: int,
+    ) -> None:
+        if item.parent is not None:
+            item.parent.interface_items.remove(item)
+        self._insert(item, parent, min(to_position, len(parent.interface_items)))
+        self._changed()
+
+    def remove(self, item: NodeTreeInterfaceItem, move_content_to_parent: bool = True) -> None:
+        parent = item.parent or self.root
+        index = parent.interface_items.index(item)
+        parent.interface_items.remove(item)
+        if isinstance(item, NodeTreeInterfacePanel) and move_content_to_parent:
+            for offset, child in enumerate(item.interface_items):
+                child.parent = parent
+                parent.interface_items.insert(index + offset, child)
+        self._changed()
+
+
+class NodeTree(ID):
+    id_type = "NODETREE"
+    bl_idname = "NodeTree"
+
+    def __init__(self, name: str, type: str = "GeometryNodeTree"):
+        super().__init__(name)
+        self.bl_idname = type
+        self.type = {
+            "GeometryNodeTree": "GEOMETRY",
+            "ShaderNodeTree": "SHADER",
+            "CompositorNodeTree": "COMPOSITING",
+            "TextureNodeTree": "TEXTURE",
+        }.get(type, "CUSTOM")
+        self.nodes = Nodes(self)
+        self.links = NodeLinks(self)
+        self.interface = NodeTreeInterface(self)
+        self.is_modifier = type == "GeometryNodeTree"
+
+    def _tag(self) -> None:
+        from . import data
+
+        data._tag(self)
+
+    def update_tag(self) -> None:
+        self._tag()
+
+    def interface_update(self, context: Any) -> None:
+        self.interface._changed()
+
+
+class ShaderNodeTree(NodeTree):
+    pass
+
+
+class GeometryNodeTree(NodeTree):
+    pass
+
+
+class CompositorNodeTree(NodeTree):
+    pass
+
+
+class NodeGroups(bpy_prop_collection):
+    def new(self, name: str, type: str) -> NodeTree:
+        tree = NodeTree(_unique_name(self, name), type)
+        self.append(tree)
+        tree._tag()
+        return tree
+
+    def remove(self, tree: NodeTree) -> None:  # type: ignore[override]
+        list.remove(self, tree)
+
+
+# --------------------------------------------------------------------------
+# Depsgraph
+# --------------------------------------------------------------------------
+
+
+class DepsgraphUpdate(bpy_struct):
+    def __init__(self, id: ID):
+        self.id = id
+        self.is_updated_geometry = False
+        self.is_updated_shading = False
+        self.is_updated_transform = False
+
+
+class Depsgraph(bpy_struct):
+    def __init__(self, updates: list[DepsgraphUpdate]):
+        self.updates = bpy_prop_collection(updates)
+
+    def id_type_updated(self, id_type: str) -> bool:
+        return any(update.id.id_type == id_type for update in self.updates)
+
+
+class Scene(ID):
+    id_type = "SCENE"
+
+
+class BlendData(bpy_struct):
+    def __init__(self) -> None:
+        self.node_groups = NodeGroups()
+        self.scenes = bpy_prop_collection([Scene("Scene")])
+        self.filepath = ""
+        self.is_dirty = False
+        self._dirty: dict[int, ID] = {}
+        self.undo_stack: list[str] = []
+
+    def _tag(self, id: ID) -> None:
+        self._dirty[id.session_uid] = id
+        self.is_dirty = True
+
+    def flush_updates(self) -> int:
+        """Send tagged IDs to the depsgraph handlers. Returns the number of IDs."""
+        from .app import handlers
+
+        updates = [DepsgraphUpdate(id) for id in self._dirty.values()]
+        self._dirty.clear()
+        if not updates:
+            return 0
+        depsgraph = Depsgraph(updates)
+        for handler in list(handlers.depsgraph_update_post):
+            handler(self.scenes[0], depsgraph)
+        return len(updates)
+
+
+# --------------------------------------------------------------------------
+# UI and context
+# --------------------------------------------------------------------------
+
+
+class Operator(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_options: set[str] = set()
+    layout = None
+    reports: list[tuple[set[str], str]] = []
+    _poll_messages: list[str] = []
+
+    @classmethod
+    def poll_message_set(cls, message: str, *args: Any) -> None:
+        Operator._poll_messages.append(message)
+
+    def report(self, type: set[str], message: str) -> None:
+        Operator.reports.append((type, message))
+        print(f"{next(iter(type))}: {message}")
+
+    @property
+    def properties(self) -> Any:
+        return self
+
+
+class Panel(bpy_struct):
+    layout = None
+
+    @classmethod
+    def poll(cls, context: Context) -> bool:
+        return True
+
+
+class Menu(bpy_struct):
+    layout = None
+    _draw_funcs: list[Callable] = []
+
+    @classmethod
+    def append(cls, func: Callable) -> None:
+        cls._draw_funcs.append(func)
+
+    @classmethod
+    def prepend(cls, func: Callable) -> None:
+        cls._draw_funcs.insert(0, func)
+
+    @classmethod
+    def remove(cls, func: Callable) -> None:
+        if func in cls._draw_funcs:
+            cls._draw_funcs.remove(func)
+
+
+class NODE_MT_context_menu(Menu):
+    _draw_funcs: list[Callable] = []
+
+
+class UIList(bpy_struct):
+    layout_type = "DEFAULT"
+
+
+class AddonPreferences(bpy_struct):
+    layout = None
+
+
+class WorkSpace(ID):
+    id_type = "WORKSPACE"
+
+    def __init__(self, name: str = "Layout"):
+        super().__init__(name)
+        self.status_text: str | None = None
+
+    def status_text_set(self, text: str | None) -> None:
+        self.status_text = text
+
+
+class Window(bpy_struct):
+    def __init__(self) -> None:
+        self.workspace = WorkSpace()
+        self.screen = None
+
+
+class WindowManager(ID):
+    id_type = "WINDOWMANAGER"
+
+    def __init__(self) -> None:
+        super().__init__("WinMan")
+        self.windows = bpy_prop_collection([Window()])
+        self.keyconfigs = type("KeyConfigs", (), {"addon": None})()
+        self.progress: float | None = None
+        self._timers: list[Any] = []
+        self._modal: list[Any] = []
+
+    def progress_begin(self, min: float, max: float) -> None:
+        self.progress = min
+
+    def progress_update(self, value: float) -> None:
+        self.progress = value
+
+    def progress_end(self) -> None:
+        self.progress = None
+
+    def event_timer_add(self, time_step: float, window: Any = None) -> Any:
+        timer = type("Timer", (), {"time_step": time_step})()
+        self._timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer: Any) -> None:
+        self._timers.remove(timer)
+
+    def modal_handler_add(self, operator: Any) -> bool:
+        self._modal.append(operator)
+        return True
+
+    def invoke_props_popup(self, operator: Any, event: Any) -> set[str]:
+        return operator.execute(operator._context)
+
+    def invoke_props_dialog(self, operator: Any, width: int = 300) -> set[str]:
+        return {"RUNNING_MODAL"}
+
+    def fileselect_add(self, operator: Any) -> None:
+        self._modal.append(operator)
+
+
+class Addon(bpy_struct):
+    def __init__(self, module: str, preferences: Any):
+        self.module = module
+        self.preferences = preferences
+
+
+class Addons(bpy_prop_collection):
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        for addon in self:
+            if addon.module == key:
+                return addon
+        from . import utils
+
+        for cls in utils._registered:
+            if issubclass(cls, AddonPreferences) and cls.bl_idname == key:
+                addon = Addon(key, _new_struct(cls))
+                self.append(addon)
+                return addon
+        return default
+
+
+class PreferencesSystem(bpy_struct):
+    ui_scale = 1.0
+
+
+class Preferences(bpy_struct):
+    def __init__(self) -> None:
+        self.system = PreferencesSystem()
+        self.addons = Addons()
+
+
+class SpaceNodeEditor(bpy_struct):
+    type = "NODE_EDITOR"
+
+    def __init__(self, node_tree: NodeTree | None = None):
+        self.node_tree = node_tree
+        self.edit_tree = node_tree
+
+
+class Context(bpy_struct):
+    def __init__(self, data: BlendData):
+        self._reset(data)
+
+    def _reset(self, data: BlendData) -> None:
+        self.__dict__.clear()
+        self.blend_data = data
+        self.preferences = Preferences()
+        self.window_manager = WindowManager()
+        self.window = None
+        self.area = None
+        self.region = None
+        self.space_data: Any = None
+        self.selected_nodes: list[Node] = []
+        self.active_node = None
+
+    @property
+    def scene(self) -> Scene:
+        return self.blend_data.scenes[0]
+
+    @property
+    def workspace(self) -> WorkSpace | None:
+        return self.window.workspace if self.window else None
+
+    @contextmanager
+    def temp_override(self, **keywords: Any) -> Iterator[Context]:
+        saved = {key: self.__dict__.get(key) for key in keywords}
+        self.__dict__.update(keywords)
+        try:
+            yield self
+        finally:
+            self.__dict__.update(saved)
+
+
+class Event(bpy_struct):
+    def __init__(self, type: str = "NONE", value: str = "NOTHING"):
+        self.type = type
+        self.value = value
+
+
+class Timer(bpy_struct):
+    pass
+
+
+UILayout = Any
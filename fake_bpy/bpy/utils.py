@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+_registered: list[type] = []
+
+
+def register_class(cls: type) -> None:
+    if getattr(cls, "is_registered", False):
+        raise ValueError(f"register_class(...): already registered as a subclass '{cls.__name__}'")
+    cls.is_registered = True
+    _registered.append(cls)
+
+
+def unregister_class(cls: type) -> None:
+    if cls in _registered:
+        _registered.remove(cls)
+    cls.is_registered = False
+
+
+def _reset() -> None:
+    for cls in list(_registered):
+        unregister_class(cls)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from bpy.props import StringProperty
+
+
+class ExportHelper:
+    filepath: StringProperty(name="File Path", subtype="FILE_PATH")  # type: ignore
+    check_existing: bool = True
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def check(self, context):
+        return False
+
+
+class ImportHelper(ExportHelper):
+    pass
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 __all__ = [
+    "absorb_edit",
     "register",
     "unregister",
 ]
 
-from typing import TYPE_CHECKING, Callable, ParamSpec, TypeVar
-from functools import partial
-from bpy.app.handlers import persistent, depsgraph_update_post
-from bpy.app.timers import register as register_timer
+from typing import TYPE_CHECKING, Callable, Iterable, ParamSpec, TypeVar
+from time import perf_counter
+import bpy
+from bpy.app.handlers import (
+    persistent,
+    depsgraph_update_post,
+    load_post,
+    undo_post,
+    redo_post,
+)
+from bpy.app.timers import (
+    register as register_timer,
+    unregister as unregister_timer,
+    is_registered as is_timer_registered,
+)
 from .operators import classes
+from . import ADDON_LABEL
+from .utils.scheduler import UpdateQueue, EditTracker, GroupDependencies
+from .utils.fingerprint import FingerprintCache
+from .utils.delta import StateCache, capture_state
 from . import utils
 
 if TYPE_CHECKING:
-    from bpy.types import Depsgraph, Scene
+    from bpy.types import Depsgraph, NodeTree, Scene
 
     P = ParamSpec("P")
     T = TypeVar("T", float, None)
@@ -22,18 +38,165 @@ if TYPE_CHECKING:
         return func
 
 
-def call_operators(updated_trees: list[str]) -> None:
-    global handler_operators
-    prefs = utils.preferences.get_preferences()
-    if not prefs:
-        return
-    active_handlers = prefs.get_active_handlers()
+def run_handlers(
+    deadline: float,
+    handlers: list[type[utils.handlers.BaseNodeTreeHandler]] | None = None,
+) -> bool:
+    """Run handlers on queued node trees until the deadline has passed.
+
+    Args:
+        handlers: Handlers to run, those active in the preferences by default
+
+    Returns:
+        Whether any node tree was modified
+    """
+    if handlers is None:
+        prefs = utils.preferences.get_preferences()
+        if not prefs:
+            update_queue.clear()
+            return False
+        active_handlers = prefs.get_active_handlers()
+        handlers = [
+            cls for cls in handler_operators if cls.bl_idname in active_handlers
+        ]
+    if not handlers:
+        update_queue.clear()
+        return False
+    # Handlers making use of deltas, tree states are tracked for them only
+    delta_handlers = {
+        cls.bl_idname for cls in handlers if utils.handlers.implements_delta(cls)
+    }
+
+    # Process groups before the trees using them, so that parents see the
+    # final state of their children and aren't processed twice. Trees not
+    # seen yet are scanned for group nodes first, within the time budget.
+    if update_queue.unordered:
+        get_node_tree = bpy.data.node_groups.get
+        names = update_queue.names()
+        if not dependencies.scan_reachable(names, get_node_tree, deadline):
+            return False
+        update_queue.reorder(dependencies.order(names, get_node_tree))
+
+    modified_trees: list[tuple[NodeTree, list[str]]] = []
+    edit_tracker.begin()
+    try:
+        # Always make progress, even if a single tree exceeds the budget
+        while update_queue:
+            node_tree_name = update_queue.pop()
+            node_tree = bpy.data.node_groups.get(node_tree_name)
+            if node_tree is None:
+                fingerprints.discard(node_tree_name)
+                dependencies.discard(node_tree_name)
+                states.discard(node_tree_name)
+                forget_node_tree(node_tree_name)
+            else:
+                # Tree type and opt-out are checked before capturing the
+                # tree, then handlers only run for the changes they react to.
+                # Value-only edits leave the fingerprint, and so all, unchanged.
+                applicable = utils.handlers.filter_handlers(node_tree, handlers)
+                if applicable:
+                    # A single walk of the tree serves fingerprint and deltas
+                    state = capture_state(node_tree)
+                    changes = fingerprints.update(node_tree, state)
+                    if "NODES" in changes:
+                        dependencies.set_children(node_tree_name, state.groups)
+                    applicable = utils.handlers.filter_handlers(
+                        node_tree, applicable, changes
+                    )
+                if applicable:
+                    tracked = [
+                        cls.bl_idname
+                        for cls in applicable
+                        if cls.bl_idname in delta_handlers
+                    ]
+                    deltas = states.deltas(node_tree_name, state, tracked)
+                    with edit_tracker.track(node_tree_name):
+                        modified = utils.handlers.run_node_tree_handlers(
+                            node_tree, applicable, deltas
+                        )
+                    if modified:
+                        edit_tracker.mark(node_tree_name)
+                        modified_trees.append((node_tree, tracked))
+                    else:
+                        states.advance(node_tree_name, state, tracked)
+            if perf_counter() >= deadline:
+                break
+    finally:
+        edit_tracker.end()
+
+    if not modified_trees:
+        return False
+    # Our own modifications aren't changes to react to next time
+    for node_tree, tracked in modified_trees:
+        _advance(node_tree, tracked)
+    return True
+
+
+def _advance(node_tree: NodeTree, tracked: Iterable[str]) -> None:
+    state = capture_state(node_tree)
+    if "NODES" in fingerprints.update(node_tree, state):
+        dependencies.set_children(node_tree.name, state.groups)
+    states.advance(node_tree.name, state, tracked)
+
+
+def absorb_edit(
+    node_tree: NodeTree, handlers: Iterable[type[utils.handlers.BaseNodeTreeHandler]]
+) -> None:
+    """Treat a modification made by handlers outside of the dispatcher as ours.
+
+    Its depsgraph echo is skipped and the tree isn't polled again for it.
+    """
+    edit_tracker.mark(node_tree.name)
+    _advance(
+        node_tree,
+        [cls.bl_idname for cls in handlers if utils.handlers.implements_delta(cls)],
+    )
+
+
+def forget_node_tree(node_tree_name: str | None = None) -> None:
+    """Drop the state handlers keep about a removed node tree, or all trees."""
     for cls in handler_operators:
-        if cls.bl_idname in active_handlers:
-            for node_tree_name in updated_trees:
-                if cls.poll_node_tree(node_tree_name):
-                    op = utils.operators.get_operator_func(cls.bl_idname)
-                    op(node_tree_name=node_tree_name)
+        cls._forget_node_tree(node_tree_name)
+
+
+def set_status(text: str | None) -> None:
+    global status_shown
+    # Avoid clearing status text set by others
+    if text is None and not status_shown:
+        return
+    wm = bpy.context.window_manager
+    if not wm:
+        return
+    for window in wm.windows:
+        if window.workspace:
+            window.workspace.status_text_set(text)
+    status_shown = text is not None
+
+
+def process_queue() -> float | None:
+    global undo_pending
+    # Updates arrived since the timer was scheduled, keep waiting
+    remaining = update_queue.remaining()
+    if remaining > 0:
+        return remaining
+
+    prefs = utils.preferences.get_preferences()
+    budget = prefs.time_budget / 1000 if prefs else DEFAULT_TIME_BUDGET
+    start = perf_counter()
+    if run_handlers(deadline=start + budget):
+        undo_pending = True
+    update_queue.record_cost(perf_counter() - start)
+
+    # Resume on the next tick, leaving room for the interface in between
+    if update_queue:
+        set_status(f"{ADDON_LABEL}: {len(update_queue)} node tree(s) pending")
+        return max(update_queue.remaining(), TICK_INTERVAL)
+    set_status(None)
+    # One undo step for all ticks of the batch, not one per tick
+    if undo_pending:
+        undo_pending = False
+        utils.operators.push_undo(f"{ADDON_LABEL} Handlers")
+    return None
 
 
 @persistent
@@ -41,20 +204,57 @@ def depsgraph_handler(scene: Scene, depsgraph: Depsgraph) -> None:
     updated_trees: list[str] = []
     for update in depsgraph.updates[:]:
         if update.id and update.id.id_type == "NODETREE":
+            utils.handlers.invalidate_analysis(update.id.name)
+            # Skip the echo of modifications made by our own handlers
+            if edit_tracker.is_own_update(update.id.name):
+                continue
             updated_trees.append(update.id.name)
 
     if not updated_trees:
         return
 
-    # Use timer for delayed processing
-    register_timer(
-        partial(call_operators, updated_trees=updated_trees),
-        first_interval=0.3,
-    )
+    # Coalesce into the pending queue and (re)arm a single debounce timer
+    delay = update_queue.push(updated_trees)
+    if not is_timer_registered(process_queue):
+        register_timer(process_queue, first_interval=delay)
+
+
+@persistent
+def load_handler(*args) -> None:
+    global undo_pending
+    # Cached state refers to trees of the previous file
+    update_queue.clear()
+    undo_pending = False
+    edit_tracker.clear()
+    fingerprints.clear()
+    dependencies.clear()
+    states.clear()
+    forget_node_tree()
+    utils.handlers.invalidate_analysis()
+    set_status(None)
+
+
+@persistent
+def undo_handler(*args) -> None:
+    # Analysis results hold references to data replaced by undo
+    utils.handlers.invalidate_analysis()
+
+
+DEFAULT_TIME_BUDGET = 0.008
+TICK_INTERVAL = 0.01
+
+update_queue = UpdateQueue()
+status_shown = False
+# Handlers modified trees during ticks of the current batch
+undo_pending = False
+edit_tracker = EditTracker()
+fingerprints = FingerprintCache()
+dependencies = GroupDependencies()
+states = StateCache()
 
-handler_operators: tuple[type[utils.handlers.BaseNodeTreeHandler], ...] = {
+handler_operators: tuple[type[utils.handlers.BaseNodeTreeHandler], ...] = tuple(
     cls for cls in classes if utils.handlers.is_handler_operator(cls)
-}  # type: ignore
+)  # type: ignore
 
 
 def register():
@@ -63,8 +263,28 @@ def register():
         return
     prefs.register_handlers(handler_operators)
     depsgraph_update_post.append(depsgraph_handler)
+    load_post.append(load_handler)
+    undo_post.append(undo_handler)
+    redo_post.append(undo_handler)
 
 
 def unregister():
+    global undo_pending
     if depsgraph_handler in depsgraph_update_post:
         depsgraph_update_post.remove(depsgraph_handler)
+    if load_handler in load_post:
+        load_post.remove(load_handler)
+    for handlers in (undo_post, redo_post):
+        if undo_handler in handlers:
+            handlers.remove(undo_handler)
+    if is_timer_registered(process_queue):
+        unregister_timer(process_queue)
+    set_status(None)
+    update_queue.clear()
+    undo_pending = False
+    edit_tracker.clear()
+    fingerprints.clear()
+    dependencies.clear()
+    states.clear()
+    forget_node_tree()
+    utils.handlers.invalidate_analysis()
@@ -8,6 +8,9 @@ from bpy.utils import register_class, unregister_class
 from .. import ADDON_LABEL
 from ..utils.nodes import get_node_tree
 from ..utils.preferences import get_preferences
+from ..utils.properties import get_custom_properties
+from ..utils.stats import performance_stats
+from ..operators import ExportHandlerStats, ResetHandlerStats
 from .menus import OperatorMenu
 
 if TYPE_CHECKING:
@@ -36,6 +39,44 @@ class PreferencesPanel(PanelBase):
         if not prefs:
             return
         prefs.draw_preferences(layout, compact=True)
+        node_tree = get_node_tree(context)
+        props = None if isinstance(node_tree, str) else get_custom_properties(node_tree)
+        if props:
+            layout.prop(props, "exclude_from_handlers")
+
+
+class StatsPanel(PanelBase):
+    bl_label = "Performance"
+    bl_idname = "NODE_PT_node_tools_stats"
+    bl_parent_id = PreferencesPanel.bl_idname
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context: Context) -> None:
+        layout = self.layout
+        if not layout:
+            return
+        row = layout.row(align=True)
+        row.operator(ResetHandlerStats.bl_idname, text="Reset", icon="TRASH")
+        row.operator(ExportHandlerStats.bl_idname, text="Export", icon="EXPORT")
+        if not performance_stats:
+            layout.label(text="No statistics recorded yet", icon="INFO")
+            return
+        for stats in performance_stats:
+            col = layout.box().column(align=True)
+            col.label(text=stats.label or stats.idname)
+            col.label(
+                text=f"Calls: {stats.calls} / {stats.polls} polls, "
+                f"Trees: {len(stats.trees)}"
+            )
+            col.label(
+                text=f"Poll: {stats.poll_time * 1000:.1f} ms, "
+                f"Execute: {stats.execute_time * 1000:.1f} ms"
+            )
+            col.label(
+                text=f"p50: {stats.percentile(0.5) * 1000:.2f} ms, "
+                f"p95: {stats.percentile(0.95) * 1000:.2f} ms, "
+                f"Max: {max(stats.latencies, default=0.0) * 1000:.2f} ms"
+            )
 
 
 class OperatorPanel(PanelBase):
@@ -57,6 +98,7 @@ class OperatorPanel(PanelBase):
 classes: tuple[type[PanelBase], ...] = (
     OperatorPanel,
     PreferencesPanel,
+    StatsPanel,
 )
 
 def register():
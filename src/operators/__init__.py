@@ -8,11 +8,15 @@ __all__ = [
     "register",
     "unregister",
     "classes",
+    "hidden_classes",
     "SplitMergeGroupInput",
     "HideRenameSingleOutputNode",
     "HideResizeNode",
     "MatchGroupInterface",
     "RandomizeSeed",
+    "ApplyHandlers",
+    "ExportHandlerStats",
+    "ResetHandlerStats",
 ]
 
 from typing import TYPE_CHECKING
@@ -22,6 +26,8 @@ from .split_group_input import SplitMergeGroupInput
 from .rename_node import HideRenameSingleOutputNode
 from .randomize_seed import RandomizeSeed
 from .match_group_interface import MatchGroupInterface
+from .apply_handlers import ApplyHandlers
+from .stats import ExportHandlerStats, ResetHandlerStats
 
 if TYPE_CHECKING:
     from ..utils.operators import BaseOperator
@@ -32,14 +38,20 @@ classes: tuple[type[BaseOperator], ...] = (
     HideRenameSingleOutputNode,
     MatchGroupInterface,
     RandomizeSeed,
+    ApplyHandlers,
+)
+# Registered, but not listed in menus
+hidden_classes: tuple[type[BaseOperator], ...] = (
+    ExportHandlerStats,
+    ResetHandlerStats,
 )
 
 
 def register():
-    for cls in classes:
+    for cls in classes + hidden_classes:
         register_class(cls)
 
 
 def unregister():
-    for cls in reversed(classes):
+    for cls in reversed(classes + hidden_classes):
         unregister_class(cls)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+__all__ = ["ApplyHandlers"]
+
+from typing import TYPE_CHECKING
+from time import perf_counter
+import bpy
+from bpy.props import EnumProperty  # type: ignore
+from ..utils.operators import BaseOperator
+from ..utils.handlers import is_handler_operator, run_handlers_on_trees
+from ..utils.preferences import get_preferences
+from ..utils.stats import performance_stats
+
+if TYPE_CHECKING:
+    from bpy.types import Context, Event, Timer
+    from ..utils.handlers import BaseNodeTreeHandler
+
+# Seconds of work per timer tick, between which progress is drawn and ESC read
+TICK_BUDGET = 0.05
+TICK_INTERVAL = 0.01
+
+# Kept alive at module level, Blender doesn't copy dynamic enum items
+_handler_items: list[tuple[str, str, str]] = []
+
+
+def get_handler_classes() -> list[type[BaseNodeTreeHandler]]:
+    # Imported late, the operators package imports this module
+    from . import classes
+
+    return [cls for cls in classes if is_handler_operator(cls)]  # type: ignore
+
+
+def get_handler_items(self, context: Context | None) -> list[tuple[str, str, str]]:
+    if not _handler_items:
+        _handler_items.extend(
+            (cls.bl_idname, cls.bl_label, cls.bl_description)
+            for cls in get_handler_classes()
+        )
+    return _handler_items
+
+
+class ApplyHandlers(BaseOperator):
+    """Run node tree handlers on every local node tree of the file"""
+
+    bl_idname = "node.apply_handlers"
+    bl_label = "Apply Handlers to All Trees"
+    bl_description = (
+        "Run the selected handlers on every local node tree of the file, "
+        "press Esc to stop early"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+    # Handlers record their own statistics
+    track_performance = False
+
+    handlers: EnumProperty(  # type: ignore
+        name="Handlers",
+        description="Handlers to run on every node tree",
+        items=get_handler_items,
+        options={"ENUM_FLAG"},
+    )
+    if TYPE_CHECKING:
+        handlers: set[str]
+
+    _timer: Timer | None = None
+
+    @classmethod
+    def _poll(cls, context: Context):
+        if not any(tree.library is None for tree in bpy.data.node_groups):
+            return "No local node trees in the file."
+
+    def invoke(self, context: Context, event: Event) -> set[str]:  # type: ignore
+        prefs = get_preferences(context)
+        if prefs:
+            available = {item[0] for item in get_handler_items(self, context)}
+            self.handlers = set(prefs.get_active_handlers()) & available
+        return context.window_manager.invoke_props_dialog(self)  # type: ignore
+
+    def _execute(self, context: Context):
+        self._handlers = [
+            cls for cls in get_handler_classes() if cls.bl_idname in self.handlers
+        ]
+        if not self._handlers:
+            return "No handlers selected."
+        names = [tree.name for tree in bpy.data.node_groups if tree.library is None]
+        self._runs = run_handlers_on_trees(names, self._handlers)
+        self._total = len(names)
+        self._processed = 0
+        self._changed = {cls.bl_idname: 0 for cls in self._handlers}
+        self._time_before = {
+            cls.bl_idname: self._get_time(cls) for cls in self._handlers
+        }
+
+        wm = context.window_manager
+        # Without a window (e.g. in background mode) there is no event loop
+        if context.window is None or wm is None:
+            self._step(deadline=float("inf"))
+            self._finish(context)
+            return
+        wm.progress_begin(0, self._total)
+        self._timer = wm.event_timer_add(TICK_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context: Context, event: Event) -> set[str]:  # type: ignore
+        if event.type == "ESC":
+            # Keep the trees processed so far, they share the operator's undo step
+            self._finish(context, cancelled=True)
+            return {"FINISHED"}
+        if event.type != "TIMER" or event.timer is not self._timer:
+            return {"RUNNING_MODAL"}
+        pending = self._step(deadline=perf_counter() + TICK_BUDGET)
+        context.window_manager.progress_update(self._processed)
+        if pending:
+            return {"RUNNING_MODAL"}
+        self._finish(context)
+        return {"FINISHED"}
+
+    @staticmethod
+    def _get_time(cls: type[BaseNodeTreeHandler]) -> float:
+        stats = performance_stats.get(cls.bl_idname, cls.bl_label)
+        return stats.poll_time + stats.execute_time
+
+    def _step(self, deadline: float) -> bool:
+        """Process trees until the deadline, returning whether some are left."""
+        # Imported late, the handlers module imports the operators package
+        from ..handlers import absorb_edit
+
+        for node_tree, modified in self._runs:
+            self._processed += 1
+            for cls in modified:
+                self._changed[cls.bl_idname] += 1
+            if modified:
+                absorb_edit(node_tree, self._handlers)
+            if perf_counter() >= deadline:
+                return True
+        return False
+
+    def _finish(self, context: Context, cancelled: bool = False) -> None:
+        wm = context.window_manager
+        if self._timer is not None and wm:
+            wm.event_timer_remove(self._timer)
+            wm.progress_end()
+            self._timer = None
+
+        if cancelled:
+            header = f"Stopped after {self._processed} of {self._total} node trees"
+        else:
+            header = f"Processed {self._processed} node trees"
+        summary = ", ".join(
+            f"{cls.bl_label}: {self._changed[cls.bl_idname]} changed "
+            f"({(self._get_time(cls) - self._time_before[cls.bl_idname]) * 1000:.1f} ms)"
+            for cls in self._handlers
+        )
+        self.report({"WARNING" if cancelled else "INFO"}, f"{header}. {summary}")
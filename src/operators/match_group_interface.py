@@ -4,7 +4,7 @@ __all__ = ["MatchGroupInterface"]
 
 from typing import cast, TYPE_CHECKING, Iterable
 from ..utils.operators import BaseOperator
-from ..utils.nodes import get_node_tree, get_selected_nodes
+from ..utils.nodes import get_node_tree, get_selected_nodes, LinkIndex
 
 if TYPE_CHECKING:
     from bpy.types import (
@@ -132,6 +132,8 @@ class MatchGroupInterface(BaseOperator):
                 parent = parent.parent
             source_id_to_panels[source_item.identifier] = parents
 
+        links = LinkIndex(node_tree.links)
+
         # Process each node individually
         for node in nodes:
             # Map target socket IDs to their corresponding interface items
@@ -147,15 +149,8 @@ class MatchGroupInterface(BaseOperator):
             sockets_map: dict[str, str] = {}
             # Set of panel IDs to create in the target node tree
             panels: set[int] = set()
-            for link in node_tree.links:
-                if not (
-                    link.from_node
-                    and link.to_node
-                    and link.from_socket
-                    and link.to_socket
-                    and link.from_node.bl_idname == "NodeGroupInput"
-                    and link.to_node == node
-                ):
+            for link in links.to_node(node):
+                if link.from_node.bl_idname != "NodeGroupInput":
                     continue
                 sockets_map[link.from_socket.identifier] = link.to_socket.identifier
                 panels.update(source_id_to_panels[link.from_socket.identifier])
@@ -2,79 +2,473 @@ from __future__ import annotations
 
 __all__ = ["RandomizeSeed"]
 
-from typing import TYPE_CHECKING
-from ..utils.handlers import BaseNodeTreeHandler
-from ..utils.nodes import is_socket_hidden, get_socket_location
+from typing import TYPE_CHECKING, Iterable
+from enum import StrEnum, auto
+from ..utils.handlers import BaseNodeTreeHandler, get_snapshot
+from ..utils.nodes import get_socket_location, LinkEntry, SocketLayoutCache
+from ..utils.preferences import get_preferences
 from ..utils.properties import get_custom_properties
+from ..utils.delta import resolve_links
+from ..utils.mutations import TreeEdit
 
 if TYPE_CHECKING:
     from bpy.types import (
         NodeTreeInterfaceSocket,
-        NodeLink,
         NodeTree,
-        Node,
         NodeSocket,
         NodeSocketInt,
+        NodeInputs,
+        NodeOutputs,
         NodeGroupInput,
         FunctionNodeRandomValue,
         FunctionNodeInputInt,
+        Node,
     )
+    from ..utils.delta import TreeDelta
+    from ..utils.snapshot import TreeSnapshot
 
 TAG = "AutoSeedRandomizer"
+# Label of the Integer node shared as ID by the randomizers of a frame
+SHARED_ID_TAG = "AutoSeedID"
+SEED_LABEL = "Seed"
+# Range of the offsets drawn by a randomizer
+SEED_RANGE = 1000000
+
+
+class SeedMode(StrEnum):
+    PER_LINK = auto()
+    COMPACT = auto()
+
+
+def is_seed_name(name: str) -> bool:
+    return name.strip().lower() == "seed"
+
+
+class SeedIndex:
+    """Seed inputs and randomizer nodes of a node tree, updated incrementally.
+
+    Only identifiers and names are kept, never references to Blender data.
+    Randomizers created outside of the handler, e.g. by undo or pasting, are
+    recognized by their label when links to them are checked.
+    """
+
+    def __init__(self) -> None:
+        # Identifiers of the interface inputs named "Seed", which are also the
+        # identifiers of the matching Group Input outputs
+        self.identifiers: frozenset[str] = frozenset()
+        # Names of the Random Value nodes inserted by the handler
+        self.randomizers: set[str] = set()
+        # Names of the Group Input and Integer nodes shared by the randomizers
+        # of a frame in compact mode, by frame name ("" outside of frames)
+        self.shared: dict[str, tuple[str, str]] = {}
+
+    def scan_interface(self, node_tree: NodeTree) -> bool:
+        """Update the seed input identifiers.
+
+        Returns:
+            Whether the identifiers changed
+        """
+        identifiers: set[str] = set()
+        if node_tree.interface is not None:
+            for item in node_tree.interface.items_tree:  # type: ignore
+                if item.item_type == "SOCKET":
+                    item: NodeTreeInterfaceSocket
+                    if item.in_out == "INPUT" and is_seed_name(item.name):
+                        identifiers.add(item.identifier)
+        changed = identifiers != self.identifiers
+        self.identifiers = frozenset(identifiers)
+        return changed
+
+    def scan_nodes(self, snapshot: TreeSnapshot) -> None:
+        self.randomizers = {
+            snapshot.names[i]
+            for i in snapshot.of_type("FunctionNodeRandomValue")
+            if snapshot.labels[i] == TAG
+        }
+
+        def frame_name(i: int) -> str:
+            parent = snapshot.parents[i]
+            return snapshot.names[parent] if parent >= 0 else ""
+
+        group_inputs = {
+            frame_name(i): snapshot.names[i]
+            for i in snapshot.of_type("NodeGroupInput")
+            if snapshot.labels[i] == SEED_LABEL
+        }
+        self.shared = {}
+        for i in snapshot.of_type("FunctionNodeInputInt"):
+            frame = frame_name(i)
+            if snapshot.labels[i] == SHARED_ID_TAG and frame in group_inputs:
+                self.shared[frame] = (group_inputs[frame], snapshot.names[i])
+
+    def is_randomizer(self, node: Node) -> bool:
+        if node.name in self.randomizers:
+            return True
+        if node.bl_idname == "FunctionNodeRandomValue" and node.label == TAG:
+            self.randomizers.add(node.name)
+            return True
+        return False
+
+    def is_seed_link(self, link: LinkEntry) -> bool:
+        """Check if a link connects a Seed group input to an unprocessed consumer."""
+        return bool(
+            link.from_node.bl_idname == "NodeGroupInput"
+            and link.from_socket.identifier in self.identifiers
+            and link.to_node.bl_idname != "NodeReroute"
+            # and is_seed_name(link.to_socket.name)
+            and not self.is_randomizer(link.to_node)
+        )
+
+    def filter_seed_links(self, links: Iterable[LinkEntry]) -> list[LinkEntry] | str:
+        seed_links = [link for link in links if self.is_seed_link(link)]
+        if not seed_links:
+            return "No seed links found"
+        return seed_links
+
+    def get_seed_links(self, snapshot: TreeSnapshot) -> list[LinkEntry] | str:
+        """Find the seed links of the whole tree."""
+        group_inputs = snapshot.of_type("NodeGroupInput")
+        if not group_inputs:
+            return "No linked seed inputs found"
+        links: list[LinkEntry] = []
+        for i in snapshot.links_from(group_inputs):
+            link = snapshot.links[i]
+            from_socket = link.from_socket
+            to_socket = link.to_socket
+            if to_socket and from_socket.identifier in self.identifiers:
+                from_node = snapshot.nodes[snapshot.link_from[i]]
+                to_node = snapshot.nodes[snapshot.link_to[i]]
+                entry = LinkEntry(link, from_node, from_socket, to_node, to_socket)
+                links.append(entry)
+        if not links:
+            return "No linked seed inputs found"
+        return self.filter_seed_links(links)
+
+
+def plan_targets(links: list[LinkEntry]) -> list[tuple[float, float]]:
+    """Absolute locations of the consumer sockets of seed links.
+
+    The tree isn't modified while planning, so the layout of each consumer is
+    computed once and reused.
+    """
+    layouts = SocketLayoutCache()
+    targets: list[tuple[float, float]] = []
+    for link in links:
+        location = get_socket_location(link.to_socket, True, cache=layouts)
+        if location is None:
+            location = (link.to_node.location.x, link.to_node.location.y)
+        targets.append(location)
+    return targets
+
+
+def get_origin(
+    node: Node, origins: dict[str, tuple[float, float]]
+) -> tuple[float, float]:
+    """Absolute location of the parent of a node, cached by parent name."""
+    parent = node.parent
+    if not parent:
+        return (0.0, 0.0)
+    origin = origins.get(parent.name)
+    if origin is None:
+        location = parent.location_absolute
+        origin = origins[parent.name] = (location.x, location.y)
+    return origin
+
+
+def get_int_socket(sockets: NodeInputs | NodeOutputs, name: str) -> NodeSocketInt:
+    """Integer socket of a node, for nodes with a socket per data type.
+
+    Looking up by name returns the first socket of that name, whatever its type.
+    """
+    for socket in sockets:
+        if socket.name == name and socket.type == "INT":
+            return socket  # type: ignore
+    return sockets[name]  # type: ignore
+
+
+def get_seed_outputs(links: list[LinkEntry], index: SeedIndex) -> dict[str, int]:
+    """Positions of the seed outputs of Group Input nodes, by identifier.
+
+    Seed inputs are matched loosely by name, so outputs are looked up by
+    identifier. All Group Input nodes of a tree have the same outputs, the
+    positions are read from an existing one before any node is created.
+    """
+    return {
+        socket.identifier: i
+        for i, socket in enumerate(links[0].from_node.outputs)
+        if socket.identifier in index.identifiers
+    }
+
+
+def wire_per_link(
+    edit: TreeEdit, links: list[LinkEntry], index: SeedIndex, counter: int
+) -> int:
+    """Route each seed link through its own Random Value node, with its own
+    Integer node as ID and its own Group Input node.
+
+    Returns:
+        The next counter value
+    """
+    count = len(links)
+    targets = plan_targets(links)
+    seed_outputs = get_seed_outputs(links, index)
+
+    # Create all nodes first, sizes are the same for all nodes of a type
+    random_nodes: list[FunctionNodeRandomValue] = edit.new_nodes(
+        "FunctionNodeRandomValue", count
+    )  # type: ignore
+    int_value_nodes: list[FunctionNodeInputInt] = edit.new_nodes(
+        "FunctionNodeInputInt", count
+    )  # type: ignore
+    group_input_nodes: list[NodeGroupInput] = edit.new_nodes(
+        "NodeGroupInput", count
+    )  # type: ignore
+    random_width = random_nodes[0].bl_width_min
+    int_width = int_value_nodes[0].bl_width_min
+    int_height = int_value_nodes[0].bl_height_min
+    group_input_width = group_input_nodes[0].bl_width_min
+
+    # Locations are computed in absolute coordinates, then made relative
+    # to the parent of the consumer
+    origins: dict[str, tuple[float, float]] = {}
+    for link, (x, y), random_node, int_value_node, group_input_node in zip(
+        links, targets, random_nodes, int_value_nodes, group_input_nodes
+    ):
+        parent = link.to_node.parent
+        origin = get_origin(link.to_node, origins)
+        random_x = x - random_width - 25 - origin[0]
+        random_y = y + 15 - origin[1]
+
+        # Random Value node
+        index.randomizers.add(random_node.name)
+        edit.set(random_node, "hide", True)
+        edit.set(random_node, "select", False)
+        edit.set(random_node, "width", random_width)
+        edit.set(random_node, "location", (random_x, random_y))
+        edit.set(random_node, "label", TAG)
+        edit.set(random_node, "data_type", "INT")
+        if parent:
+            edit.set(random_node, "parent", parent)
+
+        # Set default range for integer random values
+        get_int_socket(random_node.inputs, "Min").default_value = 0
+        get_int_socket(random_node.inputs, "Max").default_value = SEED_RANGE
+
+        # Integer Value node
+        edit.set(int_value_node, "hide", True)
+        edit.set(int_value_node, "select", False)
+        edit.set(int_value_node, "width", int_width)
+        edit.set(
+            int_value_node, "location", (random_x - int_width - 25, random_y)
+        )
+        edit.set(int_value_node, "label", str(counter))
+        edit.set(int_value_node, "integer", counter)
+        counter = counter + 1
+        if parent:
+            edit.set(int_value_node, "parent", parent)
+
+        # Group Input node
+        edit.set(group_input_node, "hide", True)
+        edit.set(group_input_node, "select", False)
+        edit.set(group_input_node, "width", group_input_width)
+        edit.set(group_input_node, "label", SEED_LABEL)
+        # Group Input nodes with Seed shown only
+        edit.show_outputs(group_input_node, seed_outputs.values())
+        # group_input_node.location = (random_node.location.x - group_input_node.width - 25, int_value_node.location.y - int_value_node.dimensions.y / bpy.context.preferences.system.ui_scale - 5)
+        edit.set(
+            group_input_node,
+            "location",
+            (random_x - group_input_width - 25, random_y - int_height - 5),
+        )
+        if parent:
+            edit.set(group_input_node, "parent", parent)
+
+        # Create new links through the Random Value node
+        seed_output = group_input_node.outputs[
+            seed_outputs[link.from_socket.identifier]
+        ]
+        edit.new_link(seed_output, random_node.inputs["Seed"])
+        edit.new_link(get_int_socket(random_node.outputs, "Value"), link.to_socket)
+        edit.new_link(int_value_node.outputs["Integer"], random_node.inputs["ID"])
+
+        # # Remove the original link
+        # node_tree.links.remove(link)
+
+        # Remove the original group input node if it has no links left,
+        # checked once after all links are created
+        edit.remove_node(link.from_node, if_unlinked=True)
+    return counter
 
 
-def get_seed_links(node_tree: NodeTree) -> list[NodeLink] | str:
+def get_shared_nodes(
+    node_tree: NodeTree, index: SeedIndex, frame: str
+) -> tuple[NodeGroupInput, FunctionNodeInputInt] | None:
+    """Shared nodes of a frame known to the index, if they still exist."""
+    names = index.shared.get(frame)
+    if names is None:
+        return None
+    group_input = node_tree.nodes.get(names[0])
+    id_node = node_tree.nodes.get(names[1])
+    for node, bl_idname in (
+        (group_input, "NodeGroupInput"),
+        (id_node, "FunctionNodeInputInt"),
+    ):
+        if node is None or node.bl_idname != bl_idname:
+            return None
+        if (node.parent.name if node.parent else "") != frame:
+            return None
+    return group_input, id_node  # type: ignore
+
+
+def wire_compact(
+    edit: TreeEdit, links: list[LinkEntry], index: SeedIndex, counter: int
+) -> int:
+    """Route each seed link through its own Random Value node, sharing the
+    Group Input node and a zero Integer node as ID between all randomizers of
+    a frame.
+
+    With the same seed and ID, randomizers draw the same value, so the
+    counter goes into their range instead to keep their values distinct.
+
+    Returns:
+        The next counter value
+    """
+    node_tree = edit.node_tree
+    count = len(links)
+    targets = plan_targets(links)
+    seed_outputs = get_seed_outputs(links, index)
+    random_nodes: list[FunctionNodeRandomValue] = edit.new_nodes(
+        "FunctionNodeRandomValue", count
+    )  # type: ignore
+    random_width = random_nodes[0].bl_width_min
+
+    # Group links by the frame of their consumer
+    frames: dict[str, list[int]] = {}
+    for i, link in enumerate(links):
+        parent = link.to_node.parent
+        frames.setdefault(parent.name if parent else "", []).append(i)
+
+    origins: dict[str, tuple[float, float]] = {}
+    for frame, indices in frames.items():
+        parent = links[indices[0]].to_node.parent
+        origin = get_origin(links[indices[0]].to_node, origins)
+        shared = get_shared_nodes(node_tree, index, frame)
+        if shared is None:
+            # Place the shared nodes left of the top most randomizer
+            group_input_node: NodeGroupInput = edit.new_node(
+                "NodeGroupInput"
+            )  # type: ignore
+            id_node: FunctionNodeInputInt = edit.new_node(
+                "FunctionNodeInputInt"
+            )  # type: ignore
+            index.shared[frame] = (group_input_node.name, id_node.name)
+            x = min(targets[i][0] for i in indices) - random_width - 25
+            y = max(targets[i][1] for i in indices) + 15
+            edit.set(id_node, "hide", True)
+            edit.set(id_node, "select", False)
+            edit.set(id_node, "width", id_node.bl_width_min)
+            edit.set(
+                id_node,
+                "location",
+                (x - id_node.bl_width_min - 25 - origin[0], y - origin[1]),
+            )
+            edit.set(id_node, "label", SHARED_ID_TAG)
+            edit.set(id_node, "integer", 0)
+            edit.set(group_input_node, "hide", True)
+            edit.set(group_input_node, "select", False)
+            edit.set(group_input_node, "width", group_input_node.bl_width_min)
+            edit.set(group_input_node, "label", SEED_LABEL)
+            edit.set(
+                group_input_node,
+                "location",
+                (
+                    x - group_input_node.bl_width_min - 25 - origin[0],
+                    y - id_node.bl_height_min - 5 - origin[1],
+                ),
+            )
+            if parent:
+                edit.set(id_node, "parent", parent)
+                edit.set(group_input_node, "parent", parent)
+        else:
+            group_input_node, id_node = shared
+        # Seed inputs may have been added since the shared node was created
+        edit.show_outputs(group_input_node, seed_outputs.values())
+        group_outputs = group_input_node.outputs
+        id_output: NodeSocket = id_node.outputs["Integer"]
+
+        for i in indices:
+            link = links[i]
+            random_node = random_nodes[i]
+            x, y = targets[i]
+            index.randomizers.add(random_node.name)
+            edit.set(random_node, "hide", True)
+            edit.set(random_node, "select", False)
+            edit.set(random_node, "width", random_width)
+            edit.set(
+                random_node,
+                "location",
+                (x - random_width - 25 - origin[0], y + 15 - origin[1]),
+            )
+            edit.set(random_node, "label", TAG)
+            edit.set(random_node, "data_type", "INT")
+            if parent:
+                edit.set(random_node, "parent", parent)
+            inputs = random_node.inputs
+            get_int_socket(inputs, "Min").default_value = counter
+            get_int_socket(inputs, "Max").default_value = counter + SEED_RANGE
+            counter = counter + 1
+
+            seed_output = group_outputs[seed_outputs[link.from_socket.identifier]]
+            edit.new_link(seed_output, random_node.inputs["Seed"])
+            edit.new_link(get_int_socket(random_node.outputs, "Value"), link.to_socket)
+            edit.new_link(id_output, random_node.inputs["ID"])
+            edit.remove_node(link.from_node, if_unlinked=True)
+    return counter
+
+
+# Seed indices by node tree name
+_seed_indices: dict[str, SeedIndex] = {}
+
+
+def get_seed_links(node_tree: NodeTree) -> list[LinkEntry] | str:
+    """Rebuild the seed index of a node tree and find all its seed links."""
     if node_tree.interface is None:
         return "Node tree has no interface"
 
-    # Check if the node tree has a seed input
-    has_seed_input = False
-    for item in node_tree.interface.items_tree:  # type: ignore
-        if item.item_type == "SOCKET":
-            item: NodeTreeInterfaceSocket
-            if item.in_out == "INPUT" and item.name.strip().lower() == "seed":
-                has_seed_input = True
-                break
-
-    if not has_seed_input:
+    index = _seed_indices[node_tree.name] = SeedIndex()
+    index.scan_interface(node_tree)
+    if not index.identifiers:
         return "Node tree has no seed input"
 
-    has_linked_seed_inputs = False
-    for node in node_tree.nodes:
-        if node.bl_idname == "NodeGroupInput":
-            for socket in node.outputs:
-                if socket.name.strip().lower() == "seed":
-                    if not is_socket_hidden(socket) and socket.is_linked:
-                        has_linked_seed_inputs = True
-                    break
-        if has_linked_seed_inputs:
-            break
-
-    if not has_linked_seed_inputs:
-        return "No linked seed inputs found"
-
-    # Find all seed links in the node tree
-    seed_links: list[NodeLink] = []
-    for link in node_tree.links:
-        if (
-            link.from_socket
-            and link.to_socket
-            and link.to_node
-            and link.from_node
-            and link.from_node.bl_idname == "NodeGroupInput"
-            and link.from_socket.name.strip().lower() == "seed"
-            and link.to_node.bl_idname != "NodeReroute"
-        ):  # and link.to_socket.name.strip().lower() == "seed":
-            if not (
-                link.to_node.bl_idname == "FunctionNodeRandomValue"
-                and link.to_node.label == TAG
-            ):
-                seed_links.append(link)
+    snapshot = get_snapshot(node_tree)
+    index.scan_nodes(snapshot)
+    return index.get_seed_links(snapshot)
 
-    if not seed_links:
-        return "No seed links found"
 
-    return seed_links
+def get_new_seed_links(
+    node_tree: NodeTree, delta: TreeDelta
+) -> list[LinkEntry] | str:
+    """Find the seed links added since the last update of the seed index."""
+    index = _seed_indices.get(node_tree.name)
+    if index is None:
+        return get_seed_links(node_tree)
+
+    index.randomizers -= delta.removed_nodes
+    # Adding or renaming interface sockets can turn existing links into seed
+    # links, other interface changes don't
+    if delta.interface_changed and index.scan_interface(node_tree):
+        if not index.identifiers:
+            return "Node tree has no seed input"
+        return index.get_seed_links(get_snapshot(node_tree))
+    if not index.identifiers:
+        return "Node tree has no seed input"
+
+    # Link keys hold the identifier of the source socket, so only links from
+    # seed inputs need to be resolved
+    keys = [key for key in delta.added_links if key[1] in index.identifiers]
+    if not keys:
+        return "No new seed links"
+    return index.filter_seed_links(resolve_links(node_tree, keys))
 
 
 class RandomizeSeed(BaseNodeTreeHandler):
@@ -84,15 +478,37 @@ class RandomizeSeed(BaseNodeTreeHandler):
     bl_label = "Randomize Seed"
     bl_description = "Randomize the seed value for the node tree."
     bl_options = {"REGISTER", "UNDO"}
+    # Random Value nodes only exist in geometry nodes, and seed links can only
+    # appear by linking or through changes of the interface
+    tree_types = {"GeometryNodeTree"}
+    triggers = {"LINKS", "INTERFACE"}
+
+    @classmethod
+    def _forget_node_tree(cls, node_tree_name: str | None = None) -> None:
+        if node_tree_name is None:
+            _seed_indices.clear()
+        else:
+            _seed_indices.pop(node_tree_name, None)
 
     @classmethod
     def _poll_node_tree(cls, node_tree: NodeTree):
         result = get_seed_links(node_tree)
         if isinstance(result, str):
             return result
+        cls._store_analysis(node_tree, result)
 
-    def _execute_node_tree(self, node_tree: NodeTree):
-        links = get_seed_links(node_tree)
+    @classmethod
+    def _poll_node_tree_delta(cls, node_tree: NodeTree, delta: TreeDelta):
+        result = get_new_seed_links(node_tree, delta)
+        if isinstance(result, str):
+            return result
+        cls._store_analysis(node_tree, result)
+
+    @classmethod
+    def _execute_node_tree(cls, node_tree: NodeTree):
+        links = cls._take_analysis(node_tree)
+        if links is None:
+            links = get_seed_links(node_tree)
         if isinstance(links, str):
             return links
 
@@ -100,97 +516,14 @@ class RandomizeSeed(BaseNodeTreeHandler):
         if props is None:
             return "Failed to get custom properties for node tree."
 
-        counter = props.auto_seed_counter
-        for link in links:
-            from_node: NodeGroupInput = link.from_node  # type: ignore
-            to_node: Node = link.to_node  # type: ignore
-            to_socket: NodeSocket = link.to_socket  # type: ignore
-            # Create Random Value node
-            random_node: FunctionNodeRandomValue = node_tree.nodes.new(
-                type="FunctionNodeRandomValue"
-            )  # type: ignore
-            random_node.hide = True
-            random_node.select = False
-            random_node.width = random_node.bl_width_min
-            location = get_socket_location(to_socket, True)
-            if location is None:
-                location = (
-                    to_node.location.x,
-                    to_node.location.y,
-                )
-            random_node.location = (
-                location[0] - random_node.width - 25,
-                location[1] + 15,
-            )
-            random_node.label = TAG
-            random_node.data_type = "INT"
-            if to_node.parent:
-                random_node.parent = to_node.parent  # type: ignore
-
-            # Set default range for integer random values
-            socket: NodeSocketInt = random_node.inputs["Min"]  # type: ignore
-            socket.default_value = 0
-            socket: NodeSocketInt = random_node.inputs["Max"]  # type: ignore
-            socket.default_value = 1000000
-
-            # Add an Integer Value Node
-            int_value_node: FunctionNodeInputInt = node_tree.nodes.new(
-                type="FunctionNodeInputInt"
-            )  # type: ignore
-            int_value_node.hide = True
-            int_value_node.select = False
-            int_value_node.width = int_value_node.bl_width_min
-            int_value_node.location = (
-                random_node.location_absolute.x - int_value_node.width - 25,
-                random_node.location_absolute.y,
-            )
-            int_value_node.label = str(counter)
-            int_value_node.integer = counter
-            counter = counter + 1
-            if to_node.parent:
-                int_value_node.parent = to_node.parent  # type: ignore
-
-            # Add a Group Input Node with Seed shown only
-            group_input_node: NodeGroupInput = node_tree.nodes.new(
-                type="NodeGroupInput"
-            )  # type: ignore
-            group_input_node.hide = True
-            group_input_node.select = False
-            group_input_node.width = group_input_node.bl_width_min
-            group_input_node.label = "Seed"
-            for socket_out in group_input_node.outputs:
-                if socket_out.name.strip().lower() == "seed":
-                    socket_out.hide = False
-                else:
-                    socket_out.hide = True
-            # group_input_node.location = (random_node.location.x - group_input_node.width - 25, int_value_node.location.y - int_value_node.dimensions.y / bpy.context.preferences.system.ui_scale - 5)
-            group_input_node.location = (
-                random_node.location_absolute.x - group_input_node.width - 25,
-                int_value_node.location_absolute.y - int_value_node.bl_height_min - 5,
-            )
-            if to_node.parent:
-                group_input_node.parent = to_node.parent  # type: ignore
-
-            # Create new links through the Random Value node
-            node_tree.links.new(
-                group_input_node.outputs["Seed"],
-                random_node.inputs["Seed"],
-                verify_limits=True,
-            )
-            node_tree.links.new(
-                random_node.outputs["Value"], to_socket, verify_limits=True
-            )
-            node_tree.links.new(
-                int_value_node.outputs["Integer"],
-                random_node.inputs["ID"],
-                verify_limits=True,
-            )
-
-            # # Remove the original link
-            # node_tree.links.remove(link)
-
-            # Check if group input node has no links, remove it
-            if not any(socket.is_linked for socket in from_node.outputs):
-                node_tree.nodes.remove(from_node)
+        index = _seed_indices.setdefault(node_tree.name, SeedIndex())
+        prefs = get_preferences()
+        mode = prefs.seed_mode if prefs is not None else SeedMode.PER_LINK
+        edit = TreeEdit(node_tree)
+        if mode == SeedMode.COMPACT:
+            counter = wire_compact(edit, links, index, props.auto_seed_counter)
+        else:
+            counter = wire_per_link(edit, links, index, props.auto_seed_counter)
+        edit.apply()
 
         props.auto_seed_counter = counter
@@ -3,26 +3,65 @@ from __future__ import annotations
 __all__ = ["HideRenameSingleOutputNode"]
 
 from typing import TYPE_CHECKING
-from ..utils.handlers import BaseNodeTreeHandler
-from ..utils.nodes import is_socket_hidden
+import numpy as np
+from ..utils.handlers import (
+    BaseNodeTreeHandler,
+    get_cached_snapshot,
+    get_snapshot,
+)
+from ..utils.mutations import NodeWrites
+from ..utils.nodes import socket_visibility
 
 if TYPE_CHECKING:
     from bpy.types import Node, NodeTree
+    from ..utils.delta import TreeDelta
 
 
 def get_nodes_with_single_output(node_tree: NodeTree) -> list[tuple[Node, str]] | str:
+    snapshot = get_snapshot(node_tree)
+    # Unlabeled nodes without visible inputs and with a single visible output
+    candidates = np.flatnonzero(
+        snapshot.unlabeled
+        & (snapshot.visible_inputs == 0)
+        & (snapshot.visible_outputs == 1)
+    )
     nodes: list[tuple[Node, str]] = []
-    for node in node_tree.nodes:
-        if node.label:
-            continue
-        if any(not is_socket_hidden(socket) for socket in node.inputs):
-            continue
-        sockets = [socket for socket in node.outputs if not is_socket_hidden(socket)]
-        if len(sockets) != 1:
+    for i in candidates:
+        node = snapshot.nodes[i]
+        socket = node.outputs[snapshot.first_visible_output(i)]
+        if socket.name == snapshot.labels[i]:
             continue
-        if sockets[0].name == node.label:
+        nodes.append((node, socket.name))
+
+    if not nodes:
+        return "No nodes to process."
+
+    return nodes
+
+
+def get_new_label(node: Node) -> str | None:
+    """Label of a node if it's an unlabeled node with a single visible output."""
+    if node.label:
+        return None
+    visibility = socket_visibility.of_node(node)
+    if visibility.inputs or len(visibility.outputs) != 1:
+        return None
+    return node.outputs[visibility.outputs[0]].name
+
+
+def get_dirty_nodes_with_single_output(
+    node_tree: NodeTree, delta: TreeDelta
+) -> list[tuple[Node, str]] | str:
+    """Check the nodes added or modified since the last delta."""
+    nodes: list[tuple[Node, str]] = []
+    tree_nodes = node_tree.nodes
+    for name in delta.added_nodes | delta.modified_nodes:
+        node = tree_nodes.get(name)
+        if node is None:
             continue
-        nodes.append((node, sockets[0].name))
+        new_label = get_new_label(node)
+        if new_label is not None:
+            nodes.append((node, new_label))
 
     if not nodes:
         return "No nodes to process."
@@ -39,20 +78,43 @@ class HideRenameSingleOutputNode(BaseNodeTreeHandler):
         "Hide single output nodes and set their label to the output socket name"
     )
     bl_options = {"REGISTER", "UNDO"}
+    # Candidates only depend on nodes, their labels and visible sockets
+    triggers = {"NODES", "LABELS", "SOCKETS"}
 
     @classmethod
     def _poll_node_tree(cls, node_tree: NodeTree):
         nodes = get_nodes_with_single_output(node_tree)
         if isinstance(nodes, str):
             return nodes
+        cls._store_analysis(node_tree, nodes)
 
-    def _execute_node_tree(self, node_tree: NodeTree):
-        nodes = get_nodes_with_single_output(node_tree)
+    @classmethod
+    def _poll_node_tree_delta(cls, node_tree: NodeTree, delta: TreeDelta):
+        # Only nodes added or modified since the last run can become candidates
+        nodes = get_dirty_nodes_with_single_output(node_tree, delta)
+        if isinstance(nodes, str):
+            return nodes
+        cls._store_analysis(node_tree, nodes)
+
+    @classmethod
+    def _execute_node_tree(cls, node_tree: NodeTree):
+        nodes = cls._take_analysis(node_tree)
+        if nodes is None:
+            nodes = get_nodes_with_single_output(node_tree)
         if isinstance(nodes, str):
             return nodes
 
+        # Reuse the node index of a full poll, deltas don't need a snapshot
+        writes = NodeWrites(node_tree, get_cached_snapshot(node_tree))
         for node, new_label in nodes:
-            node.label = new_label
-            node.hide = True
-            node.location.x += node.width - node.bl_width_min
-            node.width = node.bl_width_min
+            width = node.width
+            location = node.location
+            writes.set(node, "label", new_label)
+            writes.set(node, "hide", True)
+            writes.set(
+                node,
+                "location",
+                (location.x + width - node.bl_width_min, location.y),
+            )
+            writes.set(node, "width", node.bl_width_min)
+        writes.apply()
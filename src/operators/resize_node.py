@@ -4,7 +4,8 @@ __all__ = ["HideResizeNode"]
 
 from typing import TYPE_CHECKING
 from ..utils.operators import BaseOperator
-from ..utils.nodes import get_selected_nodes
+from ..utils.nodes import get_node_tree, get_selected_nodes
+from ..utils.mutations import NodeWrites
 
 if TYPE_CHECKING:
     from bpy.types import Context
@@ -27,7 +28,15 @@ class HideResizeNode(BaseOperator):
         # bpy.ops.node.hide_socket_toggle()
         # bpy.ops.node.hide_toggle()
 
+        node_tree = get_node_tree(context)
+        if isinstance(node_tree, str):
+            return node_tree
+
         # Resize selected nodes to minimum width if hidden, else reset to default width
+        writes = NodeWrites(node_tree)
         for node in context.selected_nodes:
-            node.hide = not node.hide
-            node.width = node.bl_width_min if node.hide else node.bl_width_default
+            hide = not node.hide
+            writes.set(node, "hide", hide)
+            width = node.bl_width_min if hide else node.bl_width_default
+            writes.set(node, "width", width)
+        writes.apply()
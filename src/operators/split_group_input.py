@@ -5,7 +5,13 @@ __all__ = ["SplitMergeGroupInput"]
 from typing import cast, TYPE_CHECKING
 from bpy.props import BoolProperty, EnumProperty  # type: ignore
 from ..utils.operators import BaseOperator
-from ..utils.nodes import get_selected_nodes, find_common_parent
+from ..utils.nodes import (
+    get_selected_nodes,
+    find_common_parent,
+    FrameHierarchy,
+    LinkIndex,
+)
+from ..utils.mutations import TreeEdit
 from enum import StrEnum, auto
 from dataclasses import dataclass, field
 
@@ -101,6 +107,9 @@ class SplitMergeGroupInput(BaseOperator):
 
         mappings: list[dict[Node | int | None, LinksGroup]] = []
         locations: dict[Node | None, Location] = {}
+        frames = FrameHierarchy()
+        links = LinkIndex(node_tree.links)
+        edit = TreeEdit(node_tree)
         x_offset = -nodes[0].bl_width_default - 25
         node_type = nodes[0].bl_idname
         for node in nodes:
@@ -114,10 +123,9 @@ class SplitMergeGroupInput(BaseOperator):
             mapping = mappings[-1]
 
             for socket_index, socket in enumerate(node.outputs):
-                if socket.links:
-                    for link in socket.links:
-                        if not link.to_node:
-                            continue
+                if socket.is_linked:
+                    for entry in links.from_socket(node, socket.identifier):
+                        link = entry.link
                         group_key = None
                         location = None
                         if self.mode == Mode.MERGE_ALL:  # type: ignore
@@ -149,14 +157,14 @@ class SplitMergeGroupInput(BaseOperator):
                                     ),
                                 )
                         elif self.mode == Mode.DEST_NODE:  # type: ignore
-                            group_key = link.to_node
+                            group_key = entry.to_node
                             location = locations.setdefault(
-                                link.to_node,
+                                entry.to_node,
                                 Location(
-                                    link.to_node.parent,
-                                    link.to_node,
-                                    link.to_node.location.x + x_offset,
-                                    link.to_node.location.y,
+                                    entry.to_node.parent,
+                                    entry.to_node,
+                                    entry.to_node.location.x + x_offset,
+                                    entry.to_node.location.y,
                                 ),
                             )
                         mapping.setdefault(
@@ -189,7 +197,7 @@ class SplitMergeGroupInput(BaseOperator):
                                 left_most_node.location.y,
                             ),
                         )
-                        parent = find_common_parent(connected_nodes)
+                        parent = find_common_parent(connected_nodes, frames)
 
                 new_node: Node | None = None
                 for socket_index, link in group.links:
@@ -197,9 +205,9 @@ class SplitMergeGroupInput(BaseOperator):
                         continue
                     if not new_node or self.mode == Mode.LINK:  # type: ignore
                         # Create a new Group Input node
-                        new_node = node_tree.nodes.new(type=node_type)
+                        new_node = edit.new_node(node_type)
                         # new_node.hide = self.mode == Mode.LINK or len(group.links) == 1
-                        new_node.hide = True
+                        edit.set(new_node, "hide", True)
                         if self.mode == Mode.LINK:  # type: ignore
                             location = locations.setdefault(
                                 link.to_node,
@@ -212,24 +220,17 @@ class SplitMergeGroupInput(BaseOperator):
                             )
                             parent = link.to_node.parent
                         if parent:
-                            new_node.parent = parent
-                        new_node.location = [location.x, location.y]
-                        new_node.select = True
-
-                        # Hide unconnected outputs
-                        for output in new_node.outputs:
-                            output.hide = True
+                            edit.set(new_node, "parent", parent)
+                        edit.set(new_node, "location", (location.x, location.y))
+                        edit.set(new_node, "select", True)
 
-                    new_node.outputs[socket_index].hide = False
+                    # Unconnected outputs stay hidden
+                    edit.show_outputs(new_node, (socket_index,))
                     to_socket = link.to_socket
                     if not to_socket:
                         continue
-                    node_tree.links.remove(link)
-                    node_tree.links.new(
-                        new_node.outputs[socket_index],
-                        to_socket,
-                        verify_limits=True,
-                    )
+                    edit.remove_link(link)
+                    edit.new_link(new_node.outputs[socket_index], to_socket)
 
                     if self.mode == Mode.LINK:  # type: ignore
                         # location.y -= new_node.dimensions.y / bpy.context.preferences.system.ui_scale
@@ -240,7 +241,8 @@ class SplitMergeGroupInput(BaseOperator):
                     location.y -= new_node.bl_height_min
 
         for node in nodes:
-            node_tree.nodes.remove(node)
+            edit.remove_node(node)
+        edit.apply()
 
     def invoke(self, context: Context, event: Event):  # type: ignore
         wm = context.window_manager
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+__all__ = ["ExportHandlerStats", "ResetHandlerStats"]
+
+from typing import TYPE_CHECKING
+from bpy.props import StringProperty  # type: ignore
+from bpy_extras.io_utils import ExportHelper
+from ..utils.operators import BaseOperator
+from ..utils.stats import performance_stats
+
+if TYPE_CHECKING:
+    from bpy.types import Context
+
+
+class ExportHandlerStats(BaseOperator, ExportHelper):
+    """Append the handler performance counters to a JSON lines file"""
+
+    bl_idname = "node.export_handler_stats"
+    bl_label = "Export Handler Stats"
+    bl_description = "Append the handler performance counters to a JSON lines file"
+    track_performance = False
+
+    filename_ext = ".jsonl"
+    filter_glob: StringProperty(  # type: ignore
+        default="*.jsonl;*.json",
+        options={"HIDDEN"},
+    )
+    if TYPE_CHECKING:
+        filepath: str
+
+    @classmethod
+    def _poll(cls, context: Context):
+        if not performance_stats:
+            return "No handler statistics recorded yet."
+
+    def _execute(self, context: Context):
+        try:
+            performance_stats.export(self.filepath)
+        except OSError as e:
+            return f"Failed to export handler statistics: {e}"
+        self.report({"INFO"}, f"Handler statistics exported to {self.filepath}")
+
+
+class ResetHandlerStats(BaseOperator):
+    """Reset the handler performance counters"""
+
+    bl_idname = "node.reset_handler_stats"
+    bl_label = "Reset Handler Stats"
+    bl_description = "Reset the handler performance counters"
+    track_performance = False
+
+    @classmethod
+    def _poll(cls, context: Context):
+        if not performance_stats:
+            return "No handler statistics recorded yet."
+
+    def _execute(self, context: Context):
+        performance_stats.reset()
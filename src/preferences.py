@@ -4,10 +4,17 @@ __all__ = ["register", "unregister"]
 
 from typing import TYPE_CHECKING, Iterable
 import bpy
-from bpy.props import BoolProperty, CollectionProperty, StringProperty  # type: ignore
+from bpy.props import (  # type: ignore
+    BoolProperty,
+    CollectionProperty,
+    EnumProperty,
+    FloatProperty,
+    StringProperty,
+)
 from bpy.types import AddonPreferences, PropertyGroup, UIList
 from bpy.utils import register_class, unregister_class
 from . import PACKAGE
+from .operators.randomize_seed import SeedMode
 
 if TYPE_CHECKING:
     from bpy.types import Context, bpy_prop_collection_idprop, UILayout
@@ -77,11 +84,41 @@ class Preferences(AddonPreferences):
         default=0,
         options={"HIDDEN", "SKIP_SAVE", "SKIP_PRESET"},
     )
+    time_budget: FloatProperty(  # type: ignore
+        name="Time Budget (ms)",
+        description=(
+            "Time handlers may spend per update before yielding to the interface, "
+            "remaining node trees are processed on the following updates"
+        ),
+        default=8.0,
+        min=1.0,
+        soft_max=100.0,
+    )
+    seed_mode: EnumProperty(  # type: ignore
+        name="Seed Wiring",
+        description="Nodes inserted to randomize the seed of each consumer",
+        items=[
+            (
+                SeedMode.PER_LINK,
+                "Per Link",
+                "Insert a Random Value, an Integer and a Group Input node per seed link",
+            ),
+            (
+                SeedMode.COMPACT,
+                "Compact",
+                "Insert a Random Value node per seed link, sharing a Group Input "
+                "and an Integer node per frame",
+            ),
+        ],
+        default=SeedMode.PER_LINK,
+    )
 
     if TYPE_CHECKING:
         handler_settings: bpy_prop_collection_idprop[NodeTreeHandlerPreference]
         # handler_settings: list[NodeTreeHandlerPreference]
         active_handler_index: int
+        time_budget: float
+        seed_mode: SeedMode
 
     def register_handlers(self, classes: Iterable[type[BaseNodeTreeHandler]]) -> None:
         existing_ids = {h.idname for h in self.handler_settings}
@@ -115,6 +152,10 @@ class Preferences(AddonPreferences):
                 self,
                 "active_handler_index",
             )
+        row = grid.row(align=True)
+        row.prop(self, "time_budget")
+        row = grid.row(align=True)
+        row.prop(self, "seed_mode")
 
     def draw(self, context: Context) -> None:
         layout = self.layout
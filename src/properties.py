@@ -4,7 +4,7 @@ __all__ = ["register", "unregister", "get_custom_properties"]
 
 from typing import TYPE_CHECKING, overload
 from bpy.types import NodeTree, PropertyGroup
-from bpy.props import PointerProperty, IntProperty  # type: ignore
+from bpy.props import BoolProperty, PointerProperty, IntProperty  # type: ignore
 from bpy.utils import register_class, unregister_class
 from types import MappingProxyType
 from . import CUSTOM_PROPS_NAME
@@ -13,27 +13,33 @@ if TYPE_CHECKING:
     from bpy.types import ID
 
 
-class AutoSeedCounterProp(PropertyGroup):
+class NodeTreeProperties(PropertyGroup):
     auto_seed_counter: IntProperty(  # type: ignore
         name="Auto Seed Counter",
         description="Auto-incremented counter for seed value generation",
         default=0,
         options={"HIDDEN"},
     )
+    exclude_from_handlers: BoolProperty(  # type: ignore
+        name="Exclude from Handlers",
+        description="Don't run automatic handlers when this node tree is updated",
+        default=False,
+    )
     if TYPE_CHECKING:
         auto_seed_counter: int = 0
+        exclude_from_handlers: bool = False
 
 property_groups_to_register: MappingProxyType[type[ID], type[PropertyGroup]] = (
     MappingProxyType(
         {
-            NodeTree: AutoSeedCounterProp,
+            NodeTree: NodeTreeProperties,
         }
     )
 )
 
 
 @overload
-def get_custom_properties(object: NodeTree) -> AutoSeedCounterProp | None: ...
+def get_custom_properties(object: NodeTree) -> NodeTreeProperties | None: ...
 @overload
 def get_custom_properties(object: ID) -> PropertyGroup | None: ...
 def get_custom_properties(object: ID) -> PropertyGroup | None:
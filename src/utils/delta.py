@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+__all__ = [
+    "LinkKey",
+    "TreeState",
+    "TreeDelta",
+    "capture_state",
+    "diff_states",
+    "resolve_links",
+    "StateCache",
+]
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable
+from .nodes import socket_visibility, LinkEntry, LinkIndex
+
+if TYPE_CHECKING:
+    from bpy.types import NodeTree
+
+# (from node name, from socket identifier, to node name, to socket identifier)
+LinkKey = tuple[str, str, str, str]
+
+
+@dataclass
+class TreeState:
+    """Lightweight snapshot of a node tree used to compute deltas.
+
+    Only names and plain values are kept, never references to Blender data,
+    so a state stays valid across undo and file reloads.
+    """
+
+    # Node name to a signature of its type, label, parent, group and sockets
+    nodes: dict[str, tuple] = field(default_factory=dict)
+    links: set[LinkKey] = field(default_factory=set)
+    # Socket identifier or panel uid to a signature of the interface item
+    interface: dict[str, tuple] = field(default_factory=dict)
+
+    @property
+    def groups(self) -> set[str]:
+        """Names of the node trees used by group nodes."""
+        return {signature[3] for signature in self.nodes.values() if signature[3]}
+
+
+@dataclass
+class TreeDelta:
+    """Changes of a node tree between two states."""
+
+    added_nodes: set[str] = field(default_factory=set)
+    removed_nodes: set[str] = field(default_factory=set)
+    modified_nodes: set[str] = field(default_factory=set)
+    added_links: set[LinkKey] = field(default_factory=set)
+    removed_links: set[LinkKey] = field(default_factory=set)
+    added_interface: set[str] = field(default_factory=set)
+    removed_interface: set[str] = field(default_factory=set)
+    modified_interface: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added_nodes
+            or self.removed_nodes
+            or self.modified_nodes
+            or self.added_links
+            or self.removed_links
+            or self.interface_changed
+        )
+
+    @property
+    def interface_changed(self) -> bool:
+        return bool(
+            self.added_interface or self.removed_interface or self.modified_interface
+        )
+
+
+def capture_state(node_tree: NodeTree) -> TreeState:
+    state = TreeState()
+    for node in node_tree.nodes:
+        state.nodes[node.name] = (
+            node.bl_idname,
+            node.label,
+            node.parent.name if node.parent else "",
+            getattr(getattr(node, "node_tree", None), "name", ""),
+            # Type plus count and bitmask of hidden sockets, read in bulk
+            socket_visibility.key(node),
+        )
+    for link in node_tree.links:
+        if link.from_node and link.to_node and link.from_socket and link.to_socket:
+            state.links.add(
+                (
+                    link.from_node.name,
+                    link.from_socket.identifier,
+                    link.to_node.name,
+                    link.to_socket.identifier,
+                )
+            )
+    if node_tree.interface:
+        for item in node_tree.interface.items_tree:
+            if item.item_type == "PANEL":
+                key = f"PANEL:{item.persistent_uid}"  # type: ignore
+            else:
+                key = item.identifier  # type: ignore
+            state.interface[key] = (
+                item.item_type,
+                item.name,
+                getattr(item, "in_out", ""),
+                getattr(item, "socket_type", ""),
+                getattr(item.parent, "persistent_uid", 0),
+            )
+    return state
+
+
+def _diff_dicts(
+    old: dict[str, tuple], new: dict[str, tuple]
+) -> tuple[set[str], set[str], set[str]]:
+    added = new.keys() - old.keys()
+    removed = old.keys() - new.keys()
+    modified = {key for key in new.keys() & old.keys() if new[key] != old[key]}
+    return set(added), set(removed), modified
+
+
+def diff_states(old: TreeState, new: TreeState) -> TreeDelta:
+    delta = TreeDelta()
+    delta.added_nodes, delta.removed_nodes, delta.modified_nodes = _diff_dicts(
+        old.nodes, new.nodes
+    )
+    delta.added_links = new.links - old.links
+    delta.removed_links = old.links - new.links
+    (
+        delta.added_interface,
+        delta.removed_interface,
+        delta.modified_interface,
+    ) = _diff_dicts(old.interface, new.interface)
+    return delta
+
+
+def _links_to_socket(
+    node_tree: NodeTree, node_name: str, identifier: str
+) -> list[LinkEntry]:
+    """Links into an input socket, read from the socket itself."""
+    node = node_tree.nodes.get(node_name)
+    if node is None:
+        return []
+    for socket in node.inputs:
+        if socket.identifier == identifier:
+            return [
+                LinkEntry(link, link.from_node, link.from_socket, node, socket)
+                for link in socket.links
+                if link.from_node and link.from_socket
+            ]
+    return []
+
+
+def resolve_links(
+    node_tree: NodeTree, keys: Iterable[LinkKey], index: LinkIndex | None = None
+) -> list[LinkEntry]:
+    """Find the links of a tree matching link keys, skipping those that are gone.
+
+    Without an index, links are read from their target sockets, so the cost
+    depends on the number of keys rather than on the size of the tree.
+    """
+    entries: list[LinkEntry] = []
+    for from_name, from_identifier, to_name, to_identifier in keys:
+        if index is not None:
+            candidates = index.to_socket(to_name, to_identifier)
+        else:
+            candidates = _links_to_socket(node_tree, to_name, to_identifier)
+        for entry in candidates:
+            if (
+                entry.from_node.name == from_name
+                and entry.from_socket.identifier == from_identifier
+            ):
+                entries.append(entry)
+    return entries
+
+
+class StateCache:
+    """Last state of node trees seen by each handler, keyed by tree name.
+
+    States are kept per handler so that a handler which was disabled or not
+    triggered in between still gets every change since it last ran.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[str, dict[str, TreeState]] = {}
+
+    def deltas(
+        self, name: str, state: TreeState, handlers: Iterable[str]
+    ) -> dict[str, TreeDelta | None]:
+        """Changes since each handler last saw a tree, None if it never did."""
+        seen = self._states.get(name, {})
+        # Handlers that saw the same state share the same delta
+        by_state: dict[int, TreeDelta] = {}
+        deltas: dict[str, TreeDelta | None] = {}
+        for handler in handlers:
+            previous = seen.get(handler)
+            if previous is None:
+                deltas[handler] = None
+                continue
+            delta = by_state.get(id(previous))
+            if delta is None:
+                delta = by_state[id(previous)] = diff_states(previous, state)
+            deltas[handler] = delta
+        return deltas
+
+    def advance(self, name: str, state: TreeState, handlers: Iterable[str]) -> None:
+        """Record that handlers have seen a tree in the given state."""
+        seen = self._states.setdefault(name, {})
+        for handler in handlers:
+            seen[handler] = state
+
+    def discard(self, name: str) -> None:
+        self._states.pop(name, None)
+
+    def clear(self) -> None:
+        self._states.clear()
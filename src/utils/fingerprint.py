@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+__all__ = [
+    "CHANGE_KINDS",
+    "TreeFingerprint",
+    "fingerprint_state",
+    "get_fingerprint",
+    "FingerprintCache",
+]
+
+from typing import TYPE_CHECKING, NamedTuple
+from .delta import capture_state
+
+if TYPE_CHECKING:
+    from bpy.types import NodeTree
+    from .delta import TreeState
+
+
+# Kinds of structural changes told apart by fingerprints
+CHANGE_KINDS = frozenset({"NODES", "LABELS", "SOCKETS", "LINKS", "INTERFACE"})
+
+
+class TreeFingerprint(NamedTuple):
+    """Structural summary of a node tree.
+
+    Only covers what handlers react to: which nodes exist, where they are
+    parented and which groups they instance, their labels, socket visibility,
+    links and the interface. Node locations and socket values are left out,
+    so moving nodes or tweaking values leaves the fingerprint unchanged.
+    """
+
+    node_count: int
+    link_count: int
+    interface_count: int
+    nodes: int
+    labels: int
+    sockets: int
+    links: int
+    interface: int
+
+    def changes(self, previous: TreeFingerprint | None) -> set[str]:
+        """Kinds of changes since a previous fingerprint, all of them if unknown."""
+        if previous is None:
+            return set(CHANGE_KINDS)
+        changes: set[str] = set()
+        if (self.node_count, self.nodes) != (previous.node_count, previous.nodes):
+            changes.add("NODES")
+        if self.labels != previous.labels:
+            changes.add("LABELS")
+        if self.sockets != previous.sockets:
+            changes.add("SOCKETS")
+        if (self.link_count, self.links) != (previous.link_count, previous.links):
+            changes.add("LINKS")
+        if (self.interface_count, self.interface) != (
+            previous.interface_count,
+            previous.interface,
+        ):
+            changes.add("INTERFACE")
+        return changes
+
+
+def fingerprint_state(state: TreeState) -> TreeFingerprint:
+    """Fingerprint of a captured tree state, avoiding a second walk of the tree."""
+    signatures = state.nodes.values()
+    node_keys = tuple(
+        # Name, type, parent and node tree used by group nodes
+        (name, signature[0], signature[2], signature[3])
+        for name, signature in state.nodes.items()
+    )
+    labels = tuple(signature[1] for signature in signatures)
+    # Socket count and visibility per node, in node order
+    sockets = tuple(signature[4] for signature in signatures)
+    interface = tuple(state.interface.items())
+
+    return TreeFingerprint(
+        node_count=len(node_keys),
+        link_count=len(state.links),
+        interface_count=len(interface),
+        nodes=hash(node_keys),
+        labels=hash(labels),
+        sockets=hash(sockets),
+        links=hash(frozenset(state.links)),
+        interface=hash(interface),
+    )
+
+
+def get_fingerprint(node_tree: NodeTree) -> TreeFingerprint:
+    return fingerprint_state(capture_state(node_tree))
+
+
+class FingerprintCache:
+    """In-memory fingerprints of node trees, keyed by name."""
+
+    def __init__(self) -> None:
+        self._fingerprints: dict[str, TreeFingerprint] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._fingerprints
+
+    def get(self, name: str) -> TreeFingerprint | None:
+        return self._fingerprints.get(name)
+
+    def update(self, node_tree: NodeTree, state: TreeState | None = None) -> set[str]:
+        """Store the current fingerprint of a tree.
+
+        The fingerprint is derived from `state` when the tree was just captured.
+
+        Returns:
+            The kinds of changes since the previous fingerprint, see
+            `TreeFingerprint.changes`. Empty if the tree didn't change.
+        """
+        if state is None:
+            fingerprint = get_fingerprint(node_tree)
+        else:
+            fingerprint = fingerprint_state(state)
+        previous = self._fingerprints.get(node_tree.name)
+        self._fingerprints[node_tree.name] = fingerprint
+        return fingerprint.changes(previous)
+
+    def discard(self, name: str) -> None:
+        self._fingerprints.pop(name, None)
+
+    def clear(self) -> None:
+        self._fingerprints.clear()
@@ -1,21 +1,171 @@
 from __future__ import annotations
 
-__all__ = ["BaseNodeTreeHandler", "is_handler_operator"]
+__all__ = [
+    "BaseNodeTreeHandler",
+    "is_handler_operator",
+    "run_node_tree_handlers",
+    "run_handlers_on_trees",
+    "invalidate_analysis",
+    "implements_delta",
+    "filter_handlers",
+    "get_snapshot",
+    "get_cached_snapshot",
+]
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, Iterator, Mapping
 from abc import abstractmethod
+from time import perf_counter
 import bpy
 from .nodes import get_node_tree
-from .operators import BaseOperator
+from .operators import BaseOperator, parse_result
+from .properties import get_custom_properties
+from .scheduler import GroupDependencies
+from .stats import performance_stats
+from .fingerprint import CHANGE_KINDS
+from .snapshot import TreeSnapshot
 from bpy.props import StringProperty  # type: ignore
 
 if TYPE_CHECKING:
     from bpy.types import Context, NodeTree
+    from .delta import TreeDelta
+
+# Analysis results computed while polling, by node tree name and handler
+_analysis: dict[str, dict[str, Any]] = {}
+# Snapshots shared by the handlers of a dispatch, by node tree name
+_snapshots: dict[str, TreeSnapshot | None] = {}
+
 
 def is_handler_operator(cls: type[BaseOperator]) -> bool:
     return issubclass(cls, BaseNodeTreeHandler)
 
+
+def invalidate_analysis(node_tree_name: str | None = None) -> None:
+    """Discard analysis results of a changed node tree, or of all trees."""
+    if node_tree_name is None:
+        _analysis.clear()
+        for name in _snapshots:
+            _snapshots[name] = None
+    else:
+        _analysis.pop(node_tree_name, None)
+        if node_tree_name in _snapshots:
+            _snapshots[node_tree_name] = None
+
+
+def get_snapshot(node_tree: NodeTree) -> TreeSnapshot:
+    """Bulk read of a node tree for poll-time analysis.
+
+    While handlers are dispatched on the tree, the snapshot is taken once
+    and shared between them until one of them modifies the tree.
+    """
+    snapshot = _snapshots.get(node_tree.name)
+    if snapshot is None:
+        snapshot = TreeSnapshot(node_tree)
+        if node_tree.name in _snapshots:
+            _snapshots[node_tree.name] = snapshot
+    return snapshot
+
+
+def get_cached_snapshot(node_tree: NodeTree) -> TreeSnapshot | None:
+    """Snapshot of a node tree already taken during the current dispatch."""
+    return _snapshots.get(node_tree.name)
+
+
+def implements_delta(cls: type[BaseNodeTreeHandler]) -> bool:
+    """Check whether a handler can poll from a delta instead of a full scan."""
+    return (
+        cls._poll_node_tree_delta.__func__  # type: ignore
+        is not BaseNodeTreeHandler._poll_node_tree_delta.__func__  # type: ignore
+    )
+
+
+def filter_handlers(
+    node_tree: NodeTree,
+    handlers: Iterable[type[BaseNodeTreeHandler]],
+    changes: set[str] | None = None,
+) -> list[type[BaseNodeTreeHandler]]:
+    """Select the handlers that apply to a node tree.
+
+    Trees excluded by the user get no handlers. When `changes` is given, only
+    handlers triggered by one of these kinds of changes are kept.
+    """
+    props = get_custom_properties(node_tree)
+    if props is not None and props.exclude_from_handlers:
+        return []
+    return [
+        cls
+        for cls in handlers
+        if (cls.tree_types is None or node_tree.bl_idname in cls.tree_types)
+        and (changes is None or cls.triggers & changes)
+    ]
+
+
+def run_node_tree_handlers(
+    node_tree: NodeTree,
+    handlers: Iterable[type[BaseNodeTreeHandler]],
+    deltas: Mapping[str, TreeDelta | None] | None = None,
+) -> list[type[BaseNodeTreeHandler]]:
+    """Run handlers on a node tree in-process, bypassing `bpy.ops`.
+
+    No undo step is pushed, callers are expected to push a single one for
+    the whole batch. When the changes since a handler last ran are known,
+    they are passed to it as `delta`, `deltas` being keyed by `bl_idname`.
+
+    Returns:
+        The handlers that modified the node tree.
+    """
+    modified: list[type[BaseNodeTreeHandler]] = []
+    # Share snapshots between handlers for the duration of the dispatch
+    _snapshots[node_tree.name] = None
+    try:
+        for cls in handlers:
+            stats = performance_stats.get(cls.bl_idname, cls.bl_label)
+            delta = deltas.get(cls.bl_idname) if deltas else None
+            start = perf_counter()
+            if delta is None:
+                msg = cls._poll_node_tree(node_tree)
+            else:
+                msg = cls._poll_node_tree_delta(node_tree, delta)
+            poll_time = perf_counter() - start
+            if isinstance(msg, str):
+                stats.record(poll_time)
+                continue
+            start = perf_counter()
+            result, _ = parse_result(cls._execute_node_tree(node_tree))
+            stats.record(poll_time, perf_counter() - start, node_tree.name)
+            if "FINISHED" in result:
+                modified.append(cls)
+                invalidate_analysis(node_tree.name)
+    finally:
+        _snapshots.pop(node_tree.name, None)
+    return modified
+
+
+def run_handlers_on_trees(
+    names: Iterable[str], handlers: Iterable[type[BaseNodeTreeHandler]]
+) -> Iterator[tuple[NodeTree, list[type[BaseNodeTreeHandler]]]]:
+    """Run handlers on node trees one at a time, see `run_node_tree_handlers`.
+
+    Groups come first, so trees instancing them see their final state. Trees
+    that no longer exist when their turn comes are skipped.
+
+    Yields:
+        Each processed node tree and the handlers that modified it.
+    """
+    handlers = list(handlers)
+    get_node_tree = bpy.data.node_groups.get
+    for name in GroupDependencies().order(names, get_node_tree):
+        node_tree = get_node_tree(name)
+        if node_tree is not None:
+            applicable = filter_handlers(node_tree, handlers)
+            yield node_tree, run_node_tree_handlers(node_tree, applicable)
+
+
 class BaseNodeTreeHandler(BaseOperator):
+    # Node tree types (`bl_idname`) the handler applies to, None for all types
+    tree_types: ClassVar[set[str] | None] = None
+    # Kinds of changes the handler reacts to, see `TreeFingerprint.changes`
+    triggers: ClassVar[set[str]] = set(CHANGE_KINDS)
+
     node_tree_name: StringProperty(  # type: ignore
         name="Node Tree Name",
         description="Name of the node tree to operate on (overrides context)",
@@ -25,9 +175,11 @@ class BaseNodeTreeHandler(BaseOperator):
     if TYPE_CHECKING:
         node_tree_name: str = ""
 
+    # Class method so handlers can run without an operator instance
+    @classmethod
     @abstractmethod
     def _execute_node_tree(
-        self, node_tree: NodeTree
+        cls, node_tree: NodeTree
     ) -> tuple[set[str], str] | set[str] | str | None: ...
 
     @classmethod
@@ -35,18 +187,35 @@ class BaseNodeTreeHandler(BaseOperator):
     def _poll_node_tree(cls, node_tree: NodeTree) -> str | None: ...
 
     @classmethod
-    def poll_node_tree(cls, node_tree_name: str) -> bool:
-        node_tree = bpy.data.node_groups.get(
-            node_tree_name, f"Node tree '{node_tree_name}' not found."
-        )
-        if isinstance(node_tree, str):
-            msg = node_tree
-        else:
-            msg = cls._poll_node_tree(node_tree)
-        if isinstance(msg, str):
-            cls.poll_message_set(msg)
-            return False
-        return True
+    def _poll_node_tree_delta(cls, node_tree: NodeTree, delta: TreeDelta) -> str | None:
+        """Poll a node tree knowing what changed since handlers last ran on it.
+
+        Handlers can override this to only look at the changed nodes, links
+        and interface items. By default the whole tree is polled.
+        """
+        return cls._poll_node_tree(node_tree)
+
+    @classmethod
+    def _forget_node_tree(cls, node_tree_name: str | None = None) -> None:
+        """Drop what the handler keeps about a removed node tree, or all trees.
+
+        Called when a tree disappears, a file is loaded or handlers are
+        unregistered. Handlers keeping per-tree state override this.
+        """
+
+    @classmethod
+    def _store_analysis(cls, node_tree: NodeTree, result: Any) -> None:
+        """Keep a result computed by `_poll_node_tree` for `_execute_node_tree`."""
+        _analysis.setdefault(node_tree.name, {})[cls.bl_idname] = result
+
+    @classmethod
+    def _take_analysis(cls, node_tree: NodeTree) -> Any | None:
+        """Get the result stored by the last poll of the tree, if still valid.
+
+        Results are consumed once and are discarded whenever the node tree
+        changes in between.
+        """
+        return _analysis.get(node_tree.name, {}).pop(cls.bl_idname, None)
 
     @classmethod
     def _poll(cls, context: Context):
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+__all__ = ["NodeWrites", "TreeEdit"]
+
+from typing import TYPE_CHECKING, Any, Iterable
+import numpy as np
+
+if TYPE_CHECKING:
+    from bpy.types import Node, NodeLink, NodeSocket, NodeTree
+    from .snapshot import TreeSnapshot
+
+# Node attributes that can be written with `foreach_set`, with their type and
+# number of components
+BULK_ATTRIBUTES: dict[str, tuple[type, int]] = {
+    "hide": (bool, 1),
+    "mute": (bool, 1),
+    "select": (bool, 1),
+    "width": (np.float32, 1),
+    "location": (np.float32, 2),
+}
+# Bulk writes rewrite the attribute of every node of the tree, so they are
+# only used when at least this fraction of the nodes is written
+BULK_RATIO = 1 / 32
+
+
+class NodeWrites:
+    """Attribute writes to the nodes of a node tree, planned then applied.
+
+    Attributes listed in `BULK_ATTRIBUTES` are written with one `foreach_get`
+    and `foreach_set` over all nodes when enough nodes are written, which
+    skips the update of every single write. Other attributes and small
+    batches are written node by node. Parents are written first, so planned
+    locations are relative to the planned parent. The tree is tagged for
+    update once after all writes are applied.
+    """
+
+    def __init__(self, node_tree: NodeTree, snapshot: TreeSnapshot | None = None):
+        self.node_tree = node_tree
+        # Node names to indices, reused from a snapshot of the current nodes
+        self._index = snapshot.index if snapshot is not None else None
+        self._writes: dict[str, dict[str, tuple[Node, Any]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(writes) for writes in self._writes.values())
+
+    def set(self, node: Node, attr: str, value: Any) -> None:
+        """Plan a write, replacing any write of the same attribute of the node."""
+        self._writes.setdefault(attr, {})[node.name] = (node, value)
+
+    def _get_index(self) -> dict[str, int]:
+        nodes = self.node_tree.nodes
+        if self._index is None or len(self._index) != len(nodes):
+            self._index = {node.name: i for i, node in enumerate(nodes)}
+        return self._index
+
+    def _apply_bulk(self, attr: str, writes: dict[str, tuple[Node, Any]]) -> None:
+        nodes = self.node_tree.nodes
+        dtype, size = BULK_ATTRIBUTES[attr]
+        values = np.empty(len(nodes) * size, dtype=dtype)
+        nodes.foreach_get(attr, values)
+        rows = values.reshape(-1, size) if size > 1 else values
+        index = self._get_index()
+        for name, (_, value) in writes.items():
+            rows[index[name]] = value
+        nodes.foreach_set(attr, values)
+
+    def apply(self, tag: bool = True) -> None:
+        if not self._writes:
+            return
+        count = len(self.node_tree.nodes)
+        attrs = sorted(self._writes, key=lambda attr: attr != "parent")
+        for attr in attrs:
+            writes = self._writes[attr]
+            if attr in BULK_ATTRIBUTES and len(writes) >= count * BULK_RATIO:
+                self._apply_bulk(attr, writes)
+            else:
+                for node, value in writes.values():
+                    setattr(node, attr, value)
+        self._writes.clear()
+        if tag:
+            self.node_tree.update_tag()
+
+
+class TreeEdit:
+    """Structural edits of a node tree, planned then applied grouped by kind.
+
+    Nodes are created right away since their sockets are needed to plan
+    links, everything else is deferred until `apply`, or the end of the
+    `with` block, which runs in this order:
+
+    1. remove planned links
+    2. write node attributes with `NodeWrites`, then socket visibility
+    3. create planned links
+    4. remove planned nodes, the ones removed only if unlinked being checked
+       once all links are created
+    5. tag the tree for update once
+
+    Blender has no way to suspend the update of a tree from Python, so link
+    and node operations still update it, but nothing is updated or checked
+    more than once per session.
+    """
+
+    def __init__(self, node_tree: NodeTree, snapshot: TreeSnapshot | None = None):
+        self.node_tree = node_tree
+        self.writes = NodeWrites(node_tree, snapshot)
+        self._removed_links: list[NodeLink] = []
+        self._new_links: list[tuple[NodeSocket, NodeSocket]] = []
+        # Node names to nodes and whether they're only removed if unlinked
+        self._removed_nodes: dict[str, tuple[Node, bool]] = {}
+        # Output collections by node name, with the outputs to show
+        self._shown_outputs: dict[str, tuple[Node, set[int]]] = {}
+
+    def __enter__(self) -> TreeEdit:
+        return self
+
+    def __exit__(self, exc_type: type | None, *_: Any) -> None:
+        if exc_type is None:
+            self.apply()
+
+    def new_node(self, bl_idname: str) -> Node:
+        return self.node_tree.nodes.new(type=bl_idname)
+
+    def new_nodes(self, bl_idname: str, count: int) -> list[Node]:
+        nodes = self.node_tree.nodes
+        return [nodes.new(type=bl_idname) for _ in range(count)]
+
+    def set(self, node: Node, attr: str, value: Any) -> None:
+        self.writes.set(node, attr, value)
+
+    def show_outputs(self, node: Node, indices: Iterable[int]) -> None:
+        """Show the given outputs of a node and hide all others.
+
+        Outputs shown by previous calls for the same node stay shown.
+        """
+        self._shown_outputs.setdefault(node.name, (node, set()))[1].update(indices)
+
+    def new_link(self, from_socket: NodeSocket, to_socket: NodeSocket) -> None:
+        self._new_links.append((from_socket, to_socket))
+
+    def remove_link(self, link: NodeLink) -> None:
+        self._removed_links.append(link)
+
+    def remove_node(self, node: Node, if_unlinked: bool = False) -> None:
+        """Remove a node, or only if none of its sockets are linked after the edit."""
+        previous = self._removed_nodes.get(node.name)
+        if previous is not None:
+            if_unlinked = if_unlinked and previous[1]
+        self._removed_nodes[node.name] = (node, if_unlinked)
+
+    def _apply_outputs(self) -> None:
+        for node, indices in self._shown_outputs.values():
+            outputs = node.outputs
+            hidden = np.ones(len(outputs), dtype=bool)
+            hidden[list(indices)] = False
+            outputs.foreach_set("hide", hidden)
+
+    def apply(self) -> None:
+        links = self.node_tree.links
+        for link in self._removed_links:
+            links.remove(link)
+        self.writes.apply(tag=False)
+        self._apply_outputs()
+        for from_socket, to_socket in self._new_links:
+            links.new(from_socket, to_socket, verify_limits=True)
+        nodes = self.node_tree.nodes
+        for node, if_unlinked in self._removed_nodes.values():
+            if if_unlinked and (
+                any(socket.is_linked for socket in node.outputs)
+                or any(socket.is_linked for socket in node.inputs)
+            ):
+                continue
+            nodes.remove(node)
+
+        self._removed_links.clear()
+        self._new_links.clear()
+        self._removed_nodes.clear()
+        self._shown_outputs.clear()
+        self.node_tree.update_tag()
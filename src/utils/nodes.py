@@ -4,25 +4,235 @@ __all__ = [
     "get_node_tree",
     "get_selected_nodes",
     "find_common_parent",
+    "FrameHierarchy",
+    "LinkEntry",
+    "LinkIndex",
     "get_socket_location",
+    "get_socket_layout",
+    "SocketLayout",
+    "SocketLayoutCache",
     "is_socket_hidden",
+    "get_hidden_mask",
+    "pack_mask",
+    "SocketVisibility",
+    "VisibilityCache",
+    "socket_visibility",
 ]
 
-from typing import TYPE_CHECKING, cast, Iterable
+from typing import TYPE_CHECKING, Any, cast, Iterable, Iterator, NamedTuple
 import bpy
+import numpy as np
 
 if TYPE_CHECKING:
-    from bpy.types import Node, NodeSocket, Context, SpaceNodeEditor, NodeTree
+    from bpy.types import (
+        Node,
+        NodeLink,
+        NodeSocket,
+        Context,
+        SpaceNodeEditor,
+        NodeTree,
+        bpy_prop_collection,
+    )
 
 
-# Code for node socket location adapted from: https://blender.stackexchange.com/a/252856/248376
 def is_socket_hidden(socket: NodeSocket) -> bool:
     """Check if a node socket is hidden or disabled."""
     return socket.hide or not socket.enabled
 
 
+def pack_mask(flags: np.ndarray) -> int:
+    """Pack booleans into an int, the first one being the lowest bit."""
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+def get_hidden_mask(sockets: bpy_prop_collection[Any]) -> int:
+    """Bitmask of the hidden or disabled sockets of a collection, read in bulk."""
+    count = len(sockets)
+    if not count:
+        return 0
+    hidden = np.empty(count, dtype=bool)
+    enabled = np.empty(count, dtype=bool)
+    sockets.foreach_get("hide", hidden)
+    sockets.foreach_get("enabled", enabled)
+    return pack_mask(hidden | ~enabled)
+
+
+def _unset_bits(mask: int, count: int) -> tuple[int, ...]:
+    return tuple(i for i in range(count) if not mask >> i & 1)
+
+
+class SocketVisibility(NamedTuple):
+    """Indices of the visible sockets of a node."""
+
+    inputs: tuple[int, ...]
+    outputs: tuple[int, ...]
+
+
+# (node type, hidden inputs mask, input count, hidden outputs mask, output count)
+VisibilityKey = tuple[str, int, int, int, int]
+
+
+class VisibilityCache:
+    """Socket visibility by node type and bitmasks of hidden sockets.
+
+    Nodes of a type with the same sockets hidden have the same visible
+    sockets, so each combination is only worked out once. Keys are read with
+    two `foreach_get` calls per socket collection instead of two attribute
+    reads per socket.
+    """
+
+    # Combinations kept before starting over
+    MAX_SIZE = 4096
+
+    def __init__(self) -> None:
+        self._cache: dict[VisibilityKey, SocketVisibility] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def key(node: Node) -> VisibilityKey:
+        inputs = node.inputs
+        outputs = node.outputs
+        return (
+            node.bl_idname,
+            get_hidden_mask(inputs),
+            len(inputs),
+            get_hidden_mask(outputs),
+            len(outputs),
+        )
+
+    def get(self, key: VisibilityKey) -> SocketVisibility:
+        visibility = self._cache.get(key)
+        if visibility is None:
+            if len(self._cache) >= self.MAX_SIZE:
+                self._cache.clear()
+            _, input_mask, input_count, output_mask, output_count = key
+            visibility = self._cache[key] = SocketVisibility(
+                _unset_bits(input_mask, input_count),
+                _unset_bits(output_mask, output_count),
+            )
+        return visibility
+
+    def of_node(self, node: Node) -> SocketVisibility:
+        return self.get(self.key(node))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+socket_visibility = VisibilityCache()
+
+
+# Code for node socket location adapted from: https://blender.stackexchange.com/a/252856/248376
+X_OFFSET = -1.0
+Y_TOP = -34.0
+Y_BOTTOM = 16.0
+Y_OFFSET = 22.0
+# 2 offsets
+VEC_BOTTOM = 28.0
+VEC_TOP = 32.0
+
+
+def _is_tall(node: Node, socket: NodeSocket) -> bool:
+    """Check if a socket should use tall spacing (vector sockets with visible values)."""
+    if socket.type != "VECTOR":
+        return False
+    if socket.hide_value:
+        return False
+    if socket.is_linked:
+        return False
+    if node.type == "BSDF_PRINCIPLED" and socket.identifier == "Subsurface Radius":
+        return False  # an exception confirms a rule?
+    return True
+
+
+class SocketLayout(NamedTuple):
+    """Locations of the visible sockets of a node, by socket identifier."""
+
+    inputs: dict[str, tuple[float, float]]
+    outputs: dict[str, tuple[float, float]]
+
+
+def get_socket_layout(
+    node: Node, absolute: bool = True, scale: float | None = None
+) -> SocketLayout | None:
+    """Calculate the locations of all visible sockets of a node in one pass.
+
+    Returns:
+        The layout, or None if the node is hidden
+    """
+    if node.hide:
+        return None
+    if scale is None:
+        scale = bpy.context.preferences.system.ui_scale
+    node_location = node.location_absolute if absolute else node.location
+    dimensions = node.dimensions
+
+    visibility = socket_visibility.of_node(node)
+
+    outputs: dict[str, tuple[float, float]] = {}
+    x = node_location.x + dimensions.x / scale + X_OFFSET
+    y = node_location.y + Y_TOP
+    node_outputs = node.outputs
+    for i in visibility.outputs:
+        socket = node_outputs[i]
+        outputs[socket.identifier] = (x, y)
+        y -= Y_OFFSET
+
+    inputs: dict[str, tuple[float, float]] = {}
+    x = node_location.x
+    y = node_location.y - dimensions.y / scale + Y_BOTTOM
+    node_inputs = node.inputs
+    for i in reversed(visibility.inputs):
+        socket = node_inputs[i]
+        tall = _is_tall(node, socket)
+        y += VEC_BOTTOM * tall
+        inputs[socket.identifier] = (x, y)
+        y += Y_OFFSET + VEC_TOP * tall
+
+    return SocketLayout(inputs, outputs)
+
+
+class SocketLayoutCache:
+    """Socket layouts of nodes, computed once per node and reused.
+
+    A layout is recomputed when the node or the visibility of its sockets
+    changed, which is cheap to check. Meant to live for one operation: node
+    locations, dimensions and links are assumed to stay the same meanwhile,
+    `discard` a node after moving or relinking it. The UI scale is read once.
+    """
+
+    def __init__(self, absolute: bool = True) -> None:
+        self.absolute = absolute
+        self.scale = bpy.context.preferences.system.ui_scale
+        self._layouts: dict[int, tuple[tuple, SocketLayout | None]] = {}
+
+    @staticmethod
+    def _key(node: Node) -> tuple:
+        return (node.hide, socket_visibility.key(node))
+
+    def get(self, node: Node) -> SocketLayout | None:
+        key = self._key(node)
+        cached = self._layouts.get(node.as_pointer())
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        layout = get_socket_layout(node, self.absolute, self.scale)
+        self._layouts[node.as_pointer()] = (key, layout)
+        return layout
+
+    def discard(self, node: Node) -> None:
+        self._layouts.pop(node.as_pointer(), None)
+
+    def clear(self) -> None:
+        self._layouts.clear()
+
+
 def get_socket_location(
-    socket: NodeSocket, is_input: bool, absolute: bool = True
+    socket: NodeSocket,
+    is_input: bool,
+    absolute: bool = True,
+    cache: SocketLayoutCache | None = None,
 ) -> tuple[float, float] | None:
     """Calculate the screen position of a node socket.
 
@@ -30,62 +240,21 @@ def get_socket_location(
         socket: The node socket to locate
         is_input: True for input socket, False for output socket
         absolute: If True, return absolute coordinates
+        cache: Layouts to reuse across calls, must match `absolute`
 
     Returns:
         (x, y) coordinates of the socket, or None if node/socket is hidden
     """
-
-    X_OFFSET = -1.0
-    Y_TOP = -34.0
-    Y_BOTTOM = 16.0
-    Y_OFFSET = 22.0
-    # 2 offsets
-    VEC_BOTTOM = 28.0
-    VEC_TOP = 32.0
-
-    def _is_tall(node: Node, socket: NodeSocket) -> bool:
-        """Check if a socket should use tall spacing (vector sockets with visible values)."""
-        if socket.type != "VECTOR":
-            return False
-        if socket.hide_value:
-            return False
-        if socket.is_linked:
-            return False
-        if node.type == "BSDF_PRINCIPLED" and socket.identifier == "Subsurface Radius":
-            return False  # an exception confirms a rule?
-        return True
-
     node = cast("Node", socket.node)
-    scale = bpy.context.preferences.system.ui_scale
     try:
-        if node.hide:
-            return None
-        node_location = node.location_absolute if absolute else node.location
-
-        if not is_input:
-            x = node_location.x + node.dimensions.x / scale + X_OFFSET
-            y = node_location.y + Y_TOP
-            for _, _socket in node.outputs.items():
-                if is_socket_hidden(_socket):
-                    if _socket.identifier == socket.identifier:
-                        return None
-                    continue
-                if _socket.identifier == socket.identifier:
-                    return x, y
-                y -= Y_OFFSET
+        if cache is not None:
+            layout = cache.get(node)
         else:
-            x = node_location.x
-            y = node_location.y - node.dimensions.y / scale + Y_BOTTOM
-            for _, _socket in reversed(node.inputs.items()):
-                if is_socket_hidden(_socket):
-                    if _socket.identifier == socket.identifier:
-                        return None
-                    continue
-                tall = _is_tall(node, _socket)
-                y += VEC_BOTTOM * tall
-                if _socket.identifier == socket.identifier:
-                    return x, y
-                y += Y_OFFSET + VEC_TOP * tall
+            layout = get_socket_layout(node, absolute)
+        if layout is None:
+            return None
+        sockets = layout.inputs if is_input else layout.outputs
+        return sockets.get(socket.identifier)
     except Exception as e:
         print(f"Error getting socket location: {e}")
         return None
@@ -140,21 +309,179 @@ def get_selected_nodes(
     return selected_nodes
 
 
-def find_common_parent(nodes: Iterable[Node]) -> Node | None:
-    """Find the common parent node for a list of nodes, if any."""
+class FrameHierarchy:
+    """Index of the frames nodes are parented to, for ancestor queries.
 
-    def get_parents(node: Node) -> list[Node]:
-        parents: list[Node] = []
-        parent = node.parent
-        while parent:
-            parents.append(parent)
-            parent = parent.parent
-        return parents
+    Nodes are added with their chain of parent frames on first use, so the
+    index can be built once per operation and shared by all its queries.
+    Common ancestors are found by binary lifting, in time logarithmic in the
+    depth of the frames.
+    """
 
-    parents = [get_parents(node) for node in nodes]
-    if not parents:
-        return None
-    for parent in parents[0]:
-        if all(parent in p for p in parents[1:]):
-            return parent
-    return None
+    def __init__(self, nodes: Iterable[Node] = ()) -> None:
+        self._nodes: dict[str, Node] = {}
+        self._depth: dict[str, int] = {}
+        # Ancestors of each node at distances 1, 2, 4, ...
+        self._up: dict[str, list[str]] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: Node) -> str:
+        """Index a node and its parent frames, returning the node's key."""
+        # Walk up to the first indexed ancestor, then index back down
+        chain: list[Node] = []
+        current: Node | None = node
+        while current is not None and current.name not in self._depth:
+            chain.append(current)
+            current = current.parent
+        for current in reversed(chain):
+            name = current.name
+            parent = current.parent
+            self._nodes[name] = current
+            if parent is None:
+                self._depth[name] = 0
+                self._up[name] = []
+                continue
+            up = [parent.name]
+            while len(self._up[up[-1]]) >= len(up):
+                up.append(self._up[up[-1]][len(up) - 1])
+            self._depth[name] = self._depth[parent.name] + 1
+            self._up[name] = up
+        return node.name
+
+    def depth(self, node: Node) -> int:
+        """Number of frames a node is nested in."""
+        return self._depth[self.add(node)]
+
+    def _ancestor(self, name: str, distance: int) -> str:
+        k = 0
+        while distance:
+            if distance & 1:
+                name = self._up[name][k]
+            distance >>= 1
+            k += 1
+        return name
+
+    def _lowest_common(self, a: str, b: str) -> str | None:
+        """Lowest common ancestor of two nodes, each counting as its own."""
+        if self._depth[a] < self._depth[b]:
+            a, b = b, a
+        a = self._ancestor(a, self._depth[a] - self._depth[b])
+        if a == b:
+            return a
+        # Same depth, so both have as many ancestors in their tables
+        for k in reversed(range(len(self._up[a]))):
+            if k < len(self._up[a]) and self._up[a][k] != self._up[b][k]:
+                a, b = self._up[a][k], self._up[b][k]
+        parent_a = self._up[a][0] if self._up[a] else None
+        parent_b = self._up[b][0] if self._up[b] else None
+        return parent_a if parent_a == parent_b else None
+
+    def common_parent(self, nodes: Iterable[Node]) -> Node | None:
+        """Find the innermost frame all nodes are nested in, if any."""
+        common: str | None = None
+        for i, node in enumerate(nodes):
+            parent = node.parent
+            if parent is None:
+                return None
+            name = self.add(parent)
+            common = name if i == 0 else self._lowest_common(common, name)  # type: ignore
+            if common is None:
+                return None
+        return self._nodes[common] if common is not None else None
+
+
+def find_common_parent(
+    nodes: Iterable[Node], hierarchy: FrameHierarchy | None = None
+) -> Node | None:
+    """Find the common parent node for a list of nodes, if any.
+
+    Pass a `FrameHierarchy` to share the index between calls.
+    """
+    if hierarchy is None:
+        hierarchy = FrameHierarchy()
+    return hierarchy.common_parent(nodes)
+
+
+class LinkEntry(NamedTuple):
+    """A link with its endpoints, read once."""
+
+    link: NodeLink
+    from_node: Node
+    from_socket: NodeSocket
+    to_node: Node
+    to_socket: NodeSocket
+
+
+class LinkIndex:
+    """Links of a node tree indexed by the nodes and sockets they connect.
+
+    Built in one pass over the links, so that an operation can look up the
+    links of a node or socket in time proportional to their number instead of
+    scanning all links, or `socket.links` which does the same. Links missing
+    an endpoint are left out. The index isn't updated when links change.
+    """
+
+    def __init__(self, links: Iterable[NodeLink]) -> None:
+        self._entries: list[LinkEntry] = []
+        self._from_node: dict[str, list[LinkEntry]] = {}
+        self._to_node: dict[str, list[LinkEntry]] = {}
+        self._from_socket: dict[tuple[str, str], list[LinkEntry]] = {}
+        self._to_socket: dict[tuple[str, str], list[LinkEntry]] = {}
+        self._from_type: dict[str, list[LinkEntry]] = {}
+        self._to_type: dict[str, list[LinkEntry]] = {}
+        for link in links:
+            from_node = link.from_node
+            to_node = link.to_node
+            from_socket = link.from_socket
+            to_socket = link.to_socket
+            if not (from_node and to_node and from_socket and to_socket):
+                continue
+            entry = LinkEntry(link, from_node, from_socket, to_node, to_socket)
+            from_name = from_node.name
+            to_name = to_node.name
+            self._entries.append(entry)
+            self._from_node.setdefault(from_name, []).append(entry)
+            self._to_node.setdefault(to_name, []).append(entry)
+            self._from_socket.setdefault(
+                (from_name, from_socket.identifier), []
+            ).append(entry)
+            self._to_socket.setdefault((to_name, to_socket.identifier), []).append(
+                entry
+            )
+            self._from_type.setdefault(from_node.bl_idname, []).append(entry)
+            self._to_type.setdefault(to_node.bl_idname, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LinkEntry]:
+        return iter(self._entries)
+
+    @staticmethod
+    def _name(node: Node | str) -> str:
+        return node if isinstance(node, str) else node.name
+
+    def from_node(self, node: Node | str) -> list[LinkEntry]:
+        """Links leaving a node."""
+        return self._from_node.get(self._name(node), [])
+
+    def to_node(self, node: Node | str) -> list[LinkEntry]:
+        """Links entering a node."""
+        return self._to_node.get(self._name(node), [])
+
+    def from_socket(self, node: Node | str, identifier: str) -> list[LinkEntry]:
+        """Links leaving an output socket of a node."""
+        return self._from_socket.get((self._name(node), identifier), [])
+
+    def to_socket(self, node: Node | str, identifier: str) -> list[LinkEntry]:
+        """Links entering an input socket of a node."""
+        return self._to_socket.get((self._name(node), identifier), [])
+
+    def from_type(self, bl_idname: str) -> list[LinkEntry]:
+        """Links leaving nodes of a type."""
+        return self._from_type.get(bl_idname, [])
+
+    def to_type(self, bl_idname: str) -> list[LinkEntry]:
+        """Links entering nodes of a type."""
+        return self._to_type.get(bl_idname, [])
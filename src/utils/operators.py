@@ -1,20 +1,46 @@
 from __future__ import annotations
 
-__all__ = ["BaseOperator", "get_operator_func"]
+__all__ = ["BaseOperator", "parse_result", "push_undo"]
 
 from typing import TYPE_CHECKING
 from abc import abstractmethod
+from time import perf_counter
 from bpy.types import Operator
 import bpy
+from .stats import performance_stats
 
 if TYPE_CHECKING:
     from bpy.types import Context
 
-def get_operator_func(idname: str):
-    module, func = idname.split(".", 1)
-    return getattr(getattr(bpy.ops, module), func)
+def parse_result(
+    result: tuple[set[str], str] | set[str] | str | None,
+) -> tuple[set[str], str | None]:
+    """Normalize the result of `_execute` to an operator return set and message."""
+    if isinstance(result, str):
+        return {"CANCELLED"}, result
+    if isinstance(result, tuple):
+        return result
+    if isinstance(result, set):
+        return result, None
+    return {"FINISHED"}, None
+
+
+def push_undo(message: str) -> None:
+    """Push an undo step, also from timers which have no window in context."""
+    context = bpy.context
+    if context.window is not None:
+        bpy.ops.ed.undo_push(message=message)
+        return
+    wm = context.window_manager
+    if not wm or not wm.windows:
+        return
+    with context.temp_override(window=wm.windows[0]):
+        bpy.ops.ed.undo_push(message=message)
 
 class BaseOperator(Operator):
+    # Record execution time in the performance statistics
+    track_performance = True
+
     @classmethod
     @abstractmethod
     def _poll(cls, context: Context) -> str | None: ...
@@ -37,15 +63,12 @@ class BaseOperator(Operator):
         return cls._poll(context) is None
 
     def execute(self, context: Context) -> set[str]:  # type: ignore
-        result = self._execute(context)
-        if isinstance(result, str):
-            _return, msg = {"CANCELLED"}, result
-        elif isinstance(result, tuple):
-            _return, msg = result
-        elif isinstance(result, set):
-            _return, msg = result, None
-        else:
-            _return, msg = {"FINISHED"}, None
+        start = perf_counter()
+        _return, msg = parse_result(self._execute(context))
+        if self.track_performance:
+            performance_stats.get(self.bl_idname, self.bl_label).record_execution(
+                perf_counter() - start
+            )
         if msg:
             self.report({"ERROR"}, msg)
         return _return
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+__all__ = ["UpdateQueue", "EditTracker", "GroupDependencies"]
+
+from contextlib import contextmanager
+from graphlib import CycleError, TopologicalSorter
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from bpy.types import NodeTree
+
+
+class UpdateQueue:
+    """Deduplicated queue of node tree names waiting to be processed.
+
+    Every push resets a single debounce deadline instead of scheduling new
+    work, so a burst of depsgraph updates (dragging a node, scrubbing a value)
+    is processed once, after it settles. The debounce delay adapts to the rate
+    of incoming updates and to the measured cost of processing them.
+    """
+
+    MIN_DELAY = 0.1
+    MAX_DELAY = 2.0
+    # Weight of the newest sample in the moving averages
+    SMOOTHING = 0.2
+
+    def __init__(self) -> None:
+        self._pending: dict[str, None] = {}
+        self._last_push: float | None = None
+        # Moving averages of the time between updates and of processing cost
+        self._interval = 0.2
+        self._cost = 0.0
+        self.deadline = 0.0
+        # Names were added since the queue was last reordered
+        self.unordered = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._pending
+
+    @property
+    def delay(self) -> float:
+        """Current debounce delay in seconds."""
+        # Wait somewhat longer than the typical gap between updates, and back
+        # off when processing is expensive so it doesn't compete with the user.
+        delay = max(self.MIN_DELAY, 1.5 * self._interval, 2.0 * self._cost)
+        return min(delay, self.MAX_DELAY)
+
+    def push(self, names: Iterable[str]) -> float:
+        """Queue node tree names and reset the debounce deadline.
+
+        Returns:
+            The delay until the queue is due.
+        """
+        now = perf_counter()
+        if self._last_push is not None:
+            gap = now - self._last_push
+            # Long pauses separate bursts and say nothing about the edit rate
+            if gap < self.MAX_DELAY:
+                self._interval += self.SMOOTHING * (gap - self._interval)
+        self._last_push = now
+
+        for name in names:
+            if name not in self._pending:
+                self._pending[name] = None
+                self.unordered = True
+
+        delay = self.delay
+        self.deadline = now + delay
+        return delay
+
+    def remaining(self) -> float:
+        """Time left until the debounce deadline, or 0 if the queue is due."""
+        return max(0.0, self.deadline - perf_counter())
+
+    def pop(self) -> str:
+        """Remove and return the oldest queued name."""
+        name = next(iter(self._pending))
+        del self._pending[name]
+        return name
+
+    def pop_all(self) -> list[str]:
+        """Remove and return all queued names in insertion order."""
+        names = list(self._pending)
+        self._pending.clear()
+        return names
+
+    def discard(self, name: str) -> None:
+        self._pending.pop(name, None)
+
+    def names(self) -> list[str]:
+        """Queued names in processing order."""
+        return list(self._pending)
+
+    def reorder(self, names: Iterable[str]) -> None:
+        """Change the processing order, `names` must match the queued names."""
+        self._pending = dict.fromkeys(names)
+        self.unordered = False
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self.unordered = False
+
+    def record_cost(self, seconds: float) -> None:
+        """Feed the measured duration of a processing run into the delay."""
+        self._cost += self.SMOOTHING * (seconds - self._cost)
+
+
+class EditTracker:
+    """Recognise depsgraph updates caused by our own handlers.
+
+    Each dispatch pass is a new generation. Trees modified during a pass are
+    marked with its generation; the next depsgraph update of such a tree is
+    the echo of that modification and is consumed instead of being queued.
+    Marks that are still unconsumed when the pass after next begins are
+    dropped, so a missed echo can't swallow a genuine user edit later on.
+    """
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.dispatching = False
+        # Tree currently being modified, its updates are always ours
+        self.current: str | None = None
+        self._edits: dict[str, int] = {}
+
+    def begin(self) -> None:
+        self.generation += 1
+        self.dispatching = True
+        self._edits = {
+            name: generation
+            for name, generation in self._edits.items()
+            if generation >= self.generation - 1
+        }
+
+    def end(self) -> None:
+        self.dispatching = False
+        self.current = None
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Attribute updates of a tree to the handler running in this block."""
+        self.current = name
+        try:
+            yield
+        finally:
+            self.current = None
+
+    def mark(self, name: str) -> None:
+        """Record that a handler modified the tree in the current generation."""
+        self._edits[name] = self.generation
+
+    def is_own_update(self, name: str) -> bool:
+        """Check (and consume) whether an update of a tree was caused by us."""
+        if name == self.current:
+            return True
+        if name not in self._edits:
+            return False
+        # Updates emitted while still dispatching precede the final echo
+        if not self.dispatching:
+            del self._edits[name]
+        return True
+
+    def clear(self) -> None:
+        self._edits.clear()
+        self.end()
+
+
+class GroupDependencies:
+    """Graph of which node trees instance which other trees in group nodes.
+
+    Trees are scanned once and rescanned on request when they change, so the
+    graph may lag behind for trees that haven't been processed since.
+    """
+
+    def __init__(self) -> None:
+        self._children: dict[str, set[str]] = {}
+
+    def scan(self, node_tree: NodeTree) -> None:
+        """(Re)build the list of trees used by a node tree."""
+        self._children[node_tree.name] = {
+            node.node_tree.name
+            for node in node_tree.nodes
+            if getattr(node, "node_tree", None) is not None
+        }
+
+    def set_children(self, name: str, children: Iterable[str]) -> None:
+        """Set the trees used by a node tree, when already known to the caller."""
+        self._children[name] = set(children)
+
+    def discard(self, name: str) -> None:
+        self._children.pop(name, None)
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    def children(
+        self, name: str, get_node_tree: Callable[[str], NodeTree | None]
+    ) -> set[str]:
+        """Trees directly used by a tree, scanning it if it wasn't yet."""
+        if name not in self._children:
+            node_tree = get_node_tree(name)
+            if node_tree is None:
+                return set()
+            self.scan(node_tree)
+        return self._children[name]
+
+    def scan_reachable(
+        self,
+        names: Iterable[str],
+        get_node_tree: Callable[[str], NodeTree | None],
+        deadline: float,
+    ) -> bool:
+        """Scan the trees reachable from `names` that weren't scanned yet.
+
+        At least one tree is scanned per call, then scanning stops once the
+        deadline has passed.
+
+        Returns:
+            Whether all reachable trees are known, so that `order` won't scan.
+        """
+        stack = list(names)
+        visited = set(stack)
+        scanned = False
+        while stack:
+            name = stack.pop()
+            if name not in self._children:
+                if scanned and perf_counter() >= deadline:
+                    return False
+                node_tree = get_node_tree(name)
+                if node_tree is None:
+                    continue
+                self.scan(node_tree)
+                scanned = True
+            for child in self._children[name]:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+        return True
+
+    def order(
+        self, names: Iterable[str], get_node_tree: Callable[[str], NodeTree | None]
+    ) -> list[str]:
+        """Sort names so that every tree comes after the trees it uses.
+
+        Dependencies through trees that aren't part of `names` are respected.
+        """
+        names = list(names)
+        selected = set(names)
+        # All trees reachable from a tree, memoized for the duration of the call
+        reachable: dict[str, set[str]] = {}
+
+        def get_reachable(name: str, visiting: set[str]) -> set[str]:
+            if name in reachable:
+                return reachable[name]
+            visiting.add(name)
+            result: set[str] = set()
+            for child in self.children(name, get_node_tree):
+                if child in visiting:
+                    continue
+                result.add(child)
+                result |= get_reachable(child, visiting)
+            visiting.discard(name)
+            reachable[name] = result
+            return result
+
+        graph = {name: get_reachable(name, set()) & selected for name in names}
+        try:
+            return list(TopologicalSorter(graph).static_order())
+        except CycleError:
+            return names
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+__all__ = ["TreeSnapshot"]
+
+from typing import TYPE_CHECKING
+from functools import cached_property
+import numpy as np
+from .nodes import pack_mask, socket_visibility
+
+if TYPE_CHECKING:
+    from bpy.types import Node, NodeLink, NodeTree
+    from .nodes import SocketVisibility
+
+
+def _segment_sums(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Sum values per segment, segment `i` spanning `offsets[i]:offsets[i + 1]`."""
+    sums = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return sums[offsets[1:]] - sums[offsets[:-1]]
+
+
+def _segment_masks(flags: np.ndarray, offsets: np.ndarray) -> list[int]:
+    """Pack the flags of each segment into an int, like `pack_mask`."""
+    counts = np.diff(offsets)
+    positions = np.arange(len(flags), dtype=np.int64) - np.repeat(offsets[:-1], counts)
+    # Bits of different positions don't overlap, so wrapping sums are exact
+    bits = np.where(
+        flags & (positions < 64),
+        np.left_shift(np.uint64(1), np.minimum(positions, 63).astype(np.uint64)),
+        np.uint64(0),
+    )
+    sums = np.concatenate(([np.uint64(0)], np.cumsum(bits, dtype=np.uint64)))
+    masks = (sums[offsets[1:]] - sums[offsets[:-1]]).tolist()
+    for i in np.flatnonzero(counts > 64):
+        masks[i] = pack_mask(flags[offsets[i] : offsets[i + 1]])
+    return masks
+
+
+class TreeSnapshot:
+    """Node and socket attributes of a node tree, read in bulk.
+
+    Strings and pointers can't be read in bulk and are read once per node
+    while collecting the nodes, indexed like `nodes`; parents are stored as
+    node indices (-1 for none). Links are stored with the indices of the
+    nodes they connect, read when first needed.
+
+    Socket flags are read with `foreach_get` into NumPy arrays, one call per
+    collection, and only when first needed. Sockets of all nodes are
+    concatenated in node order, the sockets of node `i` spanning
+    `input_offsets[i]:input_offsets[i + 1]`.
+    """
+
+    def __init__(self, node_tree: NodeTree) -> None:
+        self.node_tree = node_tree
+        self.nodes: list[Node] = list(node_tree.nodes)
+        self.names = [node.name for node in self.nodes]
+        self.bl_idnames = [node.bl_idname for node in self.nodes]
+        self.labels = [node.label for node in self.nodes]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        parents = [node.parent for node in self.nodes]
+        self.parents = np.array(
+            [self.index[parent.name] if parent else -1 for parent in parents],
+            dtype=np.int32,
+        )
+
+    def _read_sockets(self, attr: str) -> tuple[np.ndarray, np.ndarray]:
+        collections = [getattr(node, attr) for node in self.nodes]
+        counts = [len(sockets) for sockets in collections]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        hidden = np.empty(offsets[-1], dtype=bool)
+        enabled = np.empty(offsets[-1], dtype=bool)
+        for sockets, start, end in zip(collections, offsets[:-1], offsets[1:]):
+            if start == end:
+                continue
+            sockets.foreach_get("hide", hidden[start:end])
+            sockets.foreach_get("enabled", enabled[start:end])
+        # Same as `is_socket_hidden`
+        return offsets, hidden | ~enabled
+
+    @cached_property
+    def _inputs(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._read_sockets("inputs")
+
+    @cached_property
+    def _outputs(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._read_sockets("outputs")
+
+    @property
+    def input_offsets(self) -> np.ndarray:
+        return self._inputs[0]
+
+    @property
+    def input_hidden(self) -> np.ndarray:
+        """Whether each input socket is hidden, see `is_socket_hidden`."""
+        return self._inputs[1]
+
+    @property
+    def output_offsets(self) -> np.ndarray:
+        return self._outputs[0]
+
+    @property
+    def output_hidden(self) -> np.ndarray:
+        """Whether each output socket is hidden, see `is_socket_hidden`."""
+        return self._outputs[1]
+
+    @cached_property
+    def _links(self) -> tuple[list[NodeLink], np.ndarray, np.ndarray]:
+        links: list[NodeLink] = []
+        from_nodes: list[int] = []
+        to_nodes: list[int] = []
+        index = self.index
+        for link in self.node_tree.links:
+            from_node = link.from_node
+            to_node = link.to_node
+            if from_node is None or to_node is None:
+                continue
+            links.append(link)
+            from_nodes.append(index[from_node.name])
+            to_nodes.append(index[to_node.name])
+        return (
+            links,
+            np.array(from_nodes, dtype=np.int32),
+            np.array(to_nodes, dtype=np.int32),
+        )
+
+    @property
+    def links(self) -> list[NodeLink]:
+        """Links with both endpoints, in tree order."""
+        return self._links[0]
+
+    @property
+    def link_from(self) -> np.ndarray:
+        """Index of the source node per link."""
+        return self._links[1]
+
+    @property
+    def link_to(self) -> np.ndarray:
+        """Index of the target node per link."""
+        return self._links[2]
+
+    def links_from(self, nodes: list[int]) -> np.ndarray:
+        """Indices of the links leaving any of the given nodes."""
+        return np.flatnonzero(np.isin(self.link_from, nodes))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def unlabeled(self) -> np.ndarray:
+        return np.array([not label for label in self.labels], dtype=bool)
+
+    @property
+    def visible_inputs(self) -> np.ndarray:
+        """Number of visible input sockets per node."""
+        return _segment_sums(~self.input_hidden, self.input_offsets)
+
+    @property
+    def visible_outputs(self) -> np.ndarray:
+        """Number of visible output sockets per node."""
+        return _segment_sums(~self.output_hidden, self.output_offsets)
+
+    def of_type(self, bl_idname: str) -> list[int]:
+        """Indices of the nodes of a type."""
+        return [i for i, idname in enumerate(self.bl_idnames) if idname == bl_idname]
+
+    @cached_property
+    def input_masks(self) -> list[int]:
+        """Bitmask of the hidden inputs per node."""
+        return _segment_masks(self.input_hidden, self.input_offsets)
+
+    @cached_property
+    def output_masks(self) -> list[int]:
+        """Bitmask of the hidden outputs per node."""
+        return _segment_masks(self.output_hidden, self.output_offsets)
+
+    def visibility(self, i: int) -> SocketVisibility:
+        """Visible sockets of node `i`, shared between nodes alike."""
+        inputs, outputs = self.input_offsets, self.output_offsets
+        return socket_visibility.get(
+            (
+                self.bl_idnames[i],
+                self.input_masks[i],
+                int(inputs[i + 1] - inputs[i]),
+                self.output_masks[i],
+                int(outputs[i + 1] - outputs[i]),
+            )
+        )
+
+    def first_visible_output(self, i: int) -> int | None:
+        """Index within its node of the first visible output of node `i`."""
+        visible = self.visibility(i).outputs
+        return visible[0] if visible else None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+__all__ = ["HandlerStats", "PerformanceStats", "performance_stats"]
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from time import time
+from typing import Iterator
+
+# Number of latency samples kept per handler for percentiles
+MAX_SAMPLES = 1024
+
+
+@dataclass
+class HandlerStats:
+    """Counters and recent latencies of a handler or operator."""
+
+    idname: str
+    label: str = ""
+    polls: int = 0
+    calls: int = 0
+    poll_time: float = 0.0
+    execute_time: float = 0.0
+    trees: set[str] = field(default_factory=set)
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+
+    def record(
+        self,
+        poll_time: float,
+        execute_time: float | None = None,
+        tree: str | None = None,
+    ) -> None:
+        """Record one run, `execute_time` is None if it was rejected by poll."""
+        self.polls += 1
+        self.poll_time += poll_time
+        latency = poll_time
+        if execute_time is not None:
+            self.calls += 1
+            self.execute_time += execute_time
+            latency += execute_time
+            if tree:
+                self.trees.add(tree)
+        self.latencies.append(latency)
+
+    def record_execution(self, execute_time: float, tree: str | None = None) -> None:
+        """Record one run without a poll, e.g. of an operator invoked directly."""
+        self.calls += 1
+        self.execute_time += execute_time
+        if tree:
+            self.trees.add(tree)
+        self.latencies.append(execute_time)
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in seconds over the recent samples, `q` in [0, 1]."""
+        if not self.latencies:
+            return 0.0
+        samples = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "handler": self.idname,
+            "label": self.label,
+            "polls": self.polls,
+            "calls": self.calls,
+            "poll_ms": self.poll_time * 1000,
+            "execute_ms": self.execute_time * 1000,
+            "trees": len(self.trees),
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "max_ms": max(self.latencies, default=0.0) * 1000,
+        }
+
+
+class PerformanceStats:
+    """Per-handler performance counters, collected for the whole session."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, HandlerStats] = {}
+
+    def __iter__(self) -> Iterator[HandlerStats]:
+        return iter(self._stats.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._stats)
+
+    def get(self, idname: str, label: str = "") -> HandlerStats:
+        stats = self._stats.get(idname)
+        if stats is None:
+            stats = self._stats[idname] = HandlerStats(idname, label)
+        return stats
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def to_json_lines(self) -> str:
+        timestamp = time()
+        return "".join(
+            json.dumps({"timestamp": timestamp, **stats.as_dict()}) + "\n"
+            for stats in self
+        )
+
+    def export(self, filepath: str) -> None:
+        """Append one JSON line per handler to a file."""
+        with open(filepath, "a", encoding="utf-8") as f:
+            f.write(self.to_json_lines())
+
+
+performance_stats = PerformanceStats()
@@ -0,0 +1,54 @@
+"""Fixtures running the add-on under the `bpy` stand-in in fake_bpy/."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ADDON_DIR = Path(__file__).resolve().parent.parent
+ADDON_PACKAGE = "blender_tools"
+
+sys.path.insert(0, str(ADDON_DIR / "fake_bpy"))
+
+import bpy  # noqa: E402
+
+
+def load_addon():
+    """Import a fresh copy of the add-on, so module-level caches start empty."""
+    for name in [m for m in sys.modules if m.split(".")[0] == ADDON_PACKAGE]:
+        del sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        ADDON_PACKAGE,
+        ADDON_DIR / "__init__.py",
+        submodule_search_locations=[str(ADDON_DIR)],
+    )
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    sys.modules[ADDON_PACKAGE] = module
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+@pytest.fixture
+def addon():
+    """The add-on registered in an empty Blender session."""
+    bpy.reset()
+    module = load_addon()
+    module.register()
+    yield module
+    module.unregister()
+
+
+@pytest.fixture
+def node_tree(addon):
+    return bpy.data.node_groups.new("Tree", "GeometryNodeTree")
+
+
+def dispatch() -> None:
+    """Send pending depsgraph updates and run the handlers' timers."""
+    bpy.data.flush_updates()
+    bpy.app.timers.run()
+    # Echoes of the handlers' own modifications
+    bpy.data.flush_updates()
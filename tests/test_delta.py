@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+
+def test_diff_states(node_tree):
+    from blender_tools.src.utils.delta import capture_state, diff_states
+
+    a = node_tree.nodes.new("ShaderNodeValue")
+    b = node_tree.nodes.new("ShaderNodeMath")
+    removed = node_tree.nodes.new("ShaderNodeValue")
+    removed_name = removed.name
+    old = capture_state(node_tree)
+
+    node_tree.nodes.remove(removed)
+    added = node_tree.nodes.new("ShaderNodeValue")
+    a.label = "Label"
+    node_tree.links.new(added.outputs[0], b.inputs[0])
+    # Moving a node isn't a structural change
+    b.location = (100, 100)
+    delta = diff_states(old, capture_state(node_tree))
+
+    assert delta.added_nodes == {added.name}
+    assert delta.removed_nodes == {removed_name}
+    # Links and locations aren't part of node signatures
+    assert delta.modified_nodes == {a.name}
+    assert delta.added_links == {
+        (added.name, added.outputs[0].identifier, b.name, b.inputs[0].identifier)
+    }
+    assert not delta.removed_links
+    assert not delta.interface_changed
+
+
+def test_diff_states_unchanged_is_empty(node_tree):
+    from blender_tools.src.utils.delta import capture_state, diff_states
+
+    node_tree.nodes.new("ShaderNodeValue")
+    assert not diff_states(capture_state(node_tree), capture_state(node_tree))
+
+
+def test_state_cache_keeps_changes_for_handlers_that_didnt_run(node_tree):
+    from blender_tools.src.utils.delta import StateCache, capture_state
+
+    states = StateCache()
+    first = capture_state(node_tree)
+    assert states.deltas("Tree", first, ["a", "b"]) == {"a": None, "b": None}
+    states.advance("Tree", first, ["a", "b"])
+
+    first_node = node_tree.nodes.new("ShaderNodeValue")
+    second = capture_state(node_tree)
+    # Only "a" runs on the first change
+    assert states.deltas("Tree", second, ["a"])["a"].added_nodes == {first_node.name}
+    states.advance("Tree", second, ["a"])
+
+    second_node = node_tree.nodes.new("ShaderNodeValue")
+    third = capture_state(node_tree)
+    deltas = states.deltas("Tree", third, ["a", "b"])
+    assert deltas["a"].added_nodes == {second_node.name}
+    assert deltas["b"].added_nodes == {first_node.name, second_node.name}
+
+
+def test_fingerprint_changes(node_tree):
+    from blender_tools.src.utils.fingerprint import FingerprintCache
+
+    fingerprints = FingerprintCache()
+    node = node_tree.nodes.new("ShaderNodeValue")
+    assert fingerprints.update(node_tree) == {
+        "NODES",
+        "LABELS",
+        "SOCKETS",
+        "LINKS",
+        "INTERFACE",
+    }
+    node.location = (50, 50)
+    assert fingerprints.update(node_tree) == set()
+    node.label = "Label"
+    assert fingerprints.update(node_tree) == {"LABELS"}
+    node.outputs[0].hide = True
+    assert fingerprints.update(node_tree) == {"SOCKETS"}
+
+
+def test_resolve_links_without_index(node_tree):
+    from blender_tools.src.utils.delta import capture_state, resolve_links
+    from blender_tools.src.utils.nodes import LinkIndex
+
+    values = [node_tree.nodes.new("ShaderNodeValue") for _ in range(3)]
+    math = node_tree.nodes.new("ShaderNodeMath")
+    for value, socket in zip(values, math.inputs):
+        node_tree.links.new(value.outputs[0], socket)
+    keys = capture_state(node_tree).links
+    # Links that are gone are skipped
+    keys.add((values[2].name, "Value", math.name, "Missing"))
+    keys.add(("Missing", "Value", math.name, math.inputs[0].identifier))
+
+    expected = resolve_links(node_tree, keys, LinkIndex(node_tree.links))
+    resolved = resolve_links(node_tree, keys)
+    assert len(resolved) == len(math.inputs)
+    assert {entry.link for entry in resolved} == {entry.link for entry in expected}
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import bpy
+import pytest
+from conftest import dispatch
+
+
+def seed_tree(name: str, consumers: int = 3, seed_name: str = "Seed"):
+    node_tree = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    interface = node_tree.interface
+    interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    seed = interface.new_socket(seed_name, in_out="INPUT", socket_type="NodeSocketInt")
+    interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    group_input = node_tree.nodes.new("NodeGroupInput")
+    for _ in range(consumers):
+        node = node_tree.nodes.new("GeometryNodeDistributePointsOnFaces")
+        node_tree.links.new(group_input.outputs[seed.identifier], node.inputs["Seed"])
+    return node_tree
+
+
+def count_randomizers(node_tree) -> int:
+    return sum(node.bl_idname == "FunctionNodeRandomValue" for node in node_tree.nodes)
+
+
+def test_hide_rename_relabels_cleared_label(node_tree):
+    node_tree.nodes.new("ShaderNodeMath")
+    dispatch()
+    # Added once the tree is known, so only checked from the delta
+    node = node_tree.nodes.new("ShaderNodeValue")
+    dispatch()
+    assert node.label == "Value"
+    assert node.hide
+
+    node.label = ""
+    dispatch()
+    assert node.label == "Value"
+
+
+def test_hide_rename_checks_new_nodes_only(node_tree):
+    first = node_tree.nodes.new("ShaderNodeValue")
+    dispatch()
+    # A label the user changed by hand is left alone
+    first.label = "Custom"
+    second = node_tree.nodes.new("ShaderNodeValue")
+    dispatch()
+    assert first.label == "Custom"
+    assert second.label == "Value"
+
+
+def test_randomize_seed_wires_new_links(addon):
+    node_tree = seed_tree("Seeds")
+    dispatch()
+    assert count_randomizers(node_tree) == 3
+    # Our own modifications don't trigger another pass
+    dispatch()
+    assert count_randomizers(node_tree) == 3
+
+    group_input = node_tree.nodes.new("NodeGroupInput")
+    node = node_tree.nodes.new("GeometryNodeDistributePointsOnFaces")
+    node_tree.links.new(group_input.outputs["Seed"], node.inputs["Seed"])
+    dispatch()
+    assert count_randomizers(node_tree) == 4
+
+
+@pytest.mark.parametrize("mode", ["per_link", "compact"])
+def test_randomize_seed_matches_seed_input_by_identifier(addon, mode):
+    addon.src.utils.preferences.get_preferences().seed_mode = mode
+    node_tree = seed_tree("Seeds", seed_name=" seed")
+    dispatch()
+    assert count_randomizers(node_tree) == 3
+    node_count = len(node_tree.nodes)
+    node_tree.nodes.new("ShaderNodeMath")
+    dispatch()
+    assert len(node_tree.nodes) == node_count + 1
+
+
+def test_one_undo_step_per_batch(addon):
+    for i in range(20):
+        seed_tree(f"Seeds {i}")
+    dispatch()
+    assert all(count_randomizers(tree) == 3 for tree in bpy.data.node_groups)
+    assert len(bpy.data.undo_stack) == 1
+
+
+def test_apply_handlers_echo_is_absorbed(addon):
+    from blender_tools.src import handlers
+    from blender_tools.src.operators import ApplyHandlers
+
+    trees = [seed_tree(f"Seeds {i}") for i in range(3)]
+    # Created before the add-on could see them
+    bpy.data._dirty.clear()
+    operator = ApplyHandlers()
+    operator.handlers = {"node.randomize_seed"}
+    operator.execute(bpy.context)
+    assert all(count_randomizers(tree) == 3 for tree in trees)
+
+    bpy.data.flush_updates()
+    assert not handlers.update_queue
+
+
+def test_removed_tree_is_forgotten(addon):
+    from blender_tools.src import handlers
+    from blender_tools.src.operators import randomize_seed
+
+    node_tree = seed_tree("Seeds")
+    dispatch()
+    assert "Seeds" in randomize_seed._seed_indices
+
+    bpy.data.node_groups.remove(node_tree)
+    handlers.update_queue.push(["Seeds"])
+    handlers.run_handlers(float("inf"))
+    assert "Seeds" not in randomize_seed._seed_indices
+    assert "Seeds" not in handlers.fingerprints
+
+
+def test_hide_rename_delta_takes_no_snapshot(node_tree, monkeypatch):
+    from blender_tools.src.utils import handlers
+
+    for _ in range(100):
+        node_tree.nodes.new("ShaderNodeMath")
+    dispatch()
+    snapshots = []
+    original = handlers.TreeSnapshot
+    monkeypatch.setattr(
+        handlers, "TreeSnapshot", lambda tree: snapshots.append(tree) or original(tree)
+    )
+    node = node_tree.nodes.new("ShaderNodeValue")
+    dispatch()
+    assert node.label == "Value"
+    assert not snapshots
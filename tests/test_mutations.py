@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.mark.parametrize("step", [1, 100], ids=["bulk", "per_node"])
+def test_node_writes(node_tree, step):
+    from blender_tools.src.utils.mutations import NodeWrites
+
+    nodes = [node_tree.nodes.new("ShaderNodeValue") for _ in range(200)]
+    writes = NodeWrites(node_tree)
+    written = nodes[::step]
+    for i, node in enumerate(written):
+        writes.set(node, "hide", True)
+        writes.set(node, "width", 50.0 + i)
+        writes.set(node, "location", (i, -i))
+        writes.set(node, "label", f"Node {i}")
+    assert len(writes) == 4 * len(written)
+    writes.apply()
+
+    assert len(writes) == 0
+    for i, node in enumerate(written):
+        assert node.hide
+        assert node.width == 50.0 + i
+        assert tuple(node.location) == (i, -i)
+        assert node.label == f"Node {i}"
+    untouched = [node for node in nodes if node not in written]
+    assert all(not node.hide and not node.label for node in untouched)
+
+
+def test_node_writes_parent_before_location(node_tree):
+    from blender_tools.src.utils.mutations import NodeWrites
+
+    frame = node_tree.nodes.new("NodeFrame")
+    frame.location = (100, 100)
+    node = node_tree.nodes.new("ShaderNodeValue")
+    node.location = (150, 150)
+    writes = NodeWrites(node_tree)
+    # Planned relative to the new parent, whatever the order of the calls
+    writes.set(node, "location", (10, 20))
+    writes.set(node, "parent", frame)
+    writes.apply()
+    assert node.parent is frame
+    assert tuple(node.location) == (10, 20)
+    assert tuple(node.location_absolute) == (110, 120)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+
+def naive_common_parent(nodes):
+    chains = []
+    for node in nodes:
+        chain = []
+        parent = node.parent
+        while parent is not None:
+            chain.append(parent)
+            parent = parent.parent
+        chains.append(chain)
+    for parent in chains[0]:
+        if all(parent in chain for chain in chains[1:]):
+            return parent
+    return None
+
+
+def test_common_parent_matches_naive_walk(node_tree):
+    from blender_tools.src.utils.nodes import FrameHierarchy
+
+    rng = random.Random(1)
+    frames = []
+    for _ in range(200):
+        frame = node_tree.nodes.new("NodeFrame")
+        if frames and rng.random() < 0.9:
+            # Mostly parented to recent frames, for deep nesting
+            frame.parent = frames[rng.randint(max(0, len(frames) - 4), len(frames) - 1)]
+        frames.append(frame)
+    nodes = []
+    for _ in range(200):
+        node = node_tree.nodes.new("ShaderNodeMath")
+        if rng.random() < 0.95:
+            node.parent = rng.choice(frames)
+        nodes.append(node)
+
+    hierarchy = FrameHierarchy()
+    candidates = frames + nodes
+    for _ in range(1000):
+        selection = rng.sample(candidates, rng.randint(1, 4))
+        assert hierarchy.common_parent(selection) is naive_common_parent(selection)
+    assert max(hierarchy.depth(frame) for frame in frames) > 16
+
+
+def test_segment_masks_match_pack_mask(addon):
+    from blender_tools.src.utils.nodes import pack_mask
+    from blender_tools.src.utils.snapshot import _segment_masks
+
+    rng = np.random.default_rng(1)
+    # Empty segments and segments longer than 64 flags
+    counts = rng.integers(0, 150, 300)
+    counts[:10] = 0
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    flags = rng.random(offsets[-1]) < 0.5
+
+    expected = [pack_mask(flags[a:b]) for a, b in zip(offsets[:-1], offsets[1:])]
+    assert _segment_masks(flags, offsets) == expected
+
+
+def test_socket_visibility_skips_hidden_and_disabled(node_tree):
+    from blender_tools.src.utils.nodes import socket_visibility
+
+    node = node_tree.nodes.new("ShaderNodeMath")
+    node.inputs[0].hide = True
+    assert socket_visibility.of_node(node).inputs == (1,)
+    node.inputs[0].hide = False
+    node.inputs[1].enabled = False
+    visibility = socket_visibility.of_node(node)
+    assert visibility.inputs == (0,)
+    assert visibility.outputs == (0,)
+
+
+def test_snapshot_links_by_node_index(node_tree):
+    from blender_tools.src.utils.snapshot import TreeSnapshot
+
+    values = [node_tree.nodes.new("ShaderNodeValue") for _ in range(2)]
+    math = node_tree.nodes.new("ShaderNodeMath")
+    for value, socket in zip(values, math.inputs):
+        node_tree.links.new(value.outputs[0], socket)
+    snapshot = TreeSnapshot(node_tree)
+
+    assert len(snapshot.links) == 2
+    for link, i, j in zip(snapshot.links, snapshot.link_from, snapshot.link_to):
+        assert snapshot.nodes[i] is link.from_node
+        assert snapshot.nodes[j] is link.to_node
+    first = snapshot.index[values[0].name]
+    assert [snapshot.links[i].from_node for i in snapshot.links_from([first])] == [
+        values[0]
+    ]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+
+def test_edit_tracker_consumes_echo_once(addon):
+    from blender_tools.src.utils.scheduler import EditTracker
+
+    tracker = EditTracker()
+    tracker.begin()
+    tracker.mark("Tree")
+    # Updates emitted while dispatching precede the final echo
+    assert tracker.is_own_update("Tree")
+    tracker.end()
+    assert tracker.is_own_update("Tree")
+    # The next update is a genuine edit
+    assert not tracker.is_own_update("Tree")
+
+
+def test_edit_tracker_current_tree_is_always_own(addon):
+    from blender_tools.src.utils.scheduler import EditTracker
+
+    tracker = EditTracker()
+    tracker.begin()
+    with tracker.track("Tree"):
+        assert tracker.is_own_update("Tree")
+        assert tracker.is_own_update("Tree")
+        assert not tracker.is_own_update("Other")
+    assert not tracker.is_own_update("Tree")
+    tracker.end()
+
+
+def test_edit_tracker_drops_missed_echoes(addon):
+    from blender_tools.src.utils.scheduler import EditTracker
+
+    tracker = EditTracker()
+    tracker.begin()
+    tracker.mark("Tree")
+    tracker.end()
+    # The echo never came, one more pass keeps the mark
+    tracker.begin()
+    tracker.end()
+    tracker.begin()
+    tracker.end()
+    assert not tracker.is_own_update("Tree")
+
+
+def test_group_dependencies_order_groups_first(addon):
+    import bpy
+    from blender_tools.src.utils.scheduler import GroupDependencies
+
+    trees = {
+        name: bpy.data.node_groups.new(name, "GeometryNodeTree") for name in "ABCD"
+    }
+    # A uses B, B uses C, D uses C
+    for parent, child in (("A", "B"), ("B", "C"), ("D", "C")):
+        trees[parent].nodes.new("GeometryNodeGroup").node_tree = trees[child]
+    order = GroupDependencies().order(["A", "D", "C"], bpy.data.node_groups.get)
+    assert order.index("C") < order.index("A")
+    assert order.index("C") < order.index("D")
+
+
+def test_group_dependencies_scan_within_deadline(addon):
+    import bpy
+    from blender_tools.src.utils.scheduler import GroupDependencies
+
+    trees = [bpy.data.node_groups.new(f"T{i}", "GeometryNodeTree") for i in range(3)]
+    trees[0].nodes.new("GeometryNodeGroup").node_tree = trees[1]
+    dependencies = GroupDependencies()
+    names = [trees[0].name, trees[2].name]
+    get_node_tree = bpy.data.node_groups.get
+    # One tree per call once the deadline has passed, T1 is reached through T0
+    calls = 1
+    while not dependencies.scan_reachable(names, get_node_tree, deadline=0.0):
+        calls += 1
+    assert calls == 3
+    assert dependencies.scan_reachable(names, get_node_tree, deadline=0.0)
+
+
+def test_update_queue_reorders_only_new_names(addon):
+    from blender_tools.src.utils.scheduler import UpdateQueue
+
+    queue = UpdateQueue()
+    queue.push(["A", "B"])
+    assert queue.unordered
+    queue.reorder(["B", "A"])
+    queue.push(["A"])
+    assert not queue.unordered
+    queue.push(["C"])
+    assert queue.unordered